@@ -2,6 +2,8 @@
 import heapq
 import math
 
+from heuristics import heuristic_table, table_threshold
+
 class Node:
     """
     Representa um nó na busca do A*. Cada nó tem uma posição,
@@ -53,6 +55,14 @@ def a_star_search(board, start_pos, end_pos, heuristic_func):
 
     # --- NOVO: Calcula H inicial ---
     initial_h = heuristic_func(start_pos, end_pos, board.min_cost)
+
+    # Heurística em lote: se houver tabela de H para este objetivo, cada
+    # vizinho vira uma consulta na tabela em vez de uma chamada de função.
+    # Ela só é montada depois de table_threshold chamadas escalares.
+    h_table = heuristic_table(heuristic_func, board, end_pos, build=False)
+    scalar_calls = table_threshold(board)
+    size = board.size
+    moves = board.moves.offsets
     start_node.h = initial_h
     start_node.f = start_node.g + start_node.h # g é 0 no início
 
@@ -86,12 +96,7 @@ def a_star_search(board, start_pos, end_pos, heuristic_func):
             return path, nodes_expanded, g_costs, initial_h
 
         # 4. Expansão de Vizinhos (igual a antes)
-        knight_moves = [
-            (1, 2), (1, -2), (-1, 2), (-1, -2),
-            (2, 1), (2, -1), (-2, 1), (-2, -1)
-        ]
-
-        for move in knight_moves:
+        for move in moves:
             neighbor_pos = (
                 current_node.position[0] + move[0],
                 current_node.position[1] + move[1]
@@ -104,7 +109,13 @@ def a_star_search(board, start_pos, end_pos, heuristic_func):
 
             if neighbor_pos not in g_costs or new_g < g_costs[neighbor_pos]:
                 g_costs[neighbor_pos] = new_g
-                h = heuristic_func(neighbor_pos, end_pos, board.min_cost)
+                if h_table is not None:
+                    h = h_table[neighbor_pos[1] * size + neighbor_pos[0]]
+                else:
+                    h = heuristic_func(neighbor_pos, end_pos, board.min_cost)
+                    scalar_calls -= 1
+                    if not scalar_calls:
+                        h_table = heuristic_table(heuristic_func, board, end_pos)
                 f = new_g + h
 
                 neighbor_node = Node(neighbor_pos, parent=current_node)
@@ -117,3 +128,16 @@ def a_star_search(board, start_pos, end_pos, heuristic_func):
     # 5. Caminho não encontrado
     # --- MUDANÇA: Retorna initial_h ---
     return None, nodes_expanded, g_costs, initial_h
+
+
+def run_search(board, start_pos, end_pos, heuristic_func, search_function=a_star_search):
+    """
+    Executa um gerador de busca até o fim, sem animação, e devolve a tupla
+    final (path, nodes_expanded, g_costs, initial_h).
+    """
+    gen = search_function(board, start_pos, end_pos, heuristic_func)
+    while True:
+        try:
+            next(gen)
+        except StopIteration as e:
+            return e.value
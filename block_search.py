@@ -0,0 +1,380 @@
+# block_search.py
+import argparse
+import heapq
+import math
+import time
+from collections import deque
+from functools import lru_cache
+
+from a_star import Node, a_star_search, run_search
+from board import Board
+from heuristics import h1_chebyshev, h3_knight_unbounded, heuristic_table, step_heuristic, table_threshold
+
+# Horizonte dos macro-movimentos, em saltos. De uma casa interna só geramos
+# as casas a até MACRO_HORIZON saltos dentro da região (as da borda, as que
+# estão exatamente no horizonte e o objetivo), então o custo de cada expansão
+# não cresce com o tamanho da região.
+MACRO_HORIZON = 2
+
+
+class UniformRegion:
+    """
+    Retângulo do tabuleiro em que todas as casas têm o mesmo custo.
+    (x0, y0) é o canto superior esquerdo; w e h são largura e altura;
+    'moves' são os saltos da peça (board.moves).
+    """
+    def __init__(self, x0, y0, w, h, cost, moves):
+        self.x0 = x0
+        self.y0 = y0
+        self.w = w
+        self.h = h
+        self.cost = cost
+        self.moves = moves
+
+    def contains(self, pos):
+        x, y = pos
+        return self.x0 <= x < self.x0 + self.w and self.y0 <= y < self.y0 + self.h
+
+    def is_interior(self, pos):
+        """
+        Uma casa é interna se nenhum salto a partir dela sai da região
+        (ou seja, está a pelo menos moves.reach casas de todas as bordas).
+        """
+        x, y = pos
+        r = self.moves.reach
+        return (self.x0 + r <= x < self.x0 + self.w - r and
+                self.y0 + r <= y < self.y0 + self.h - r)
+
+    def exit_depth(self, pos, board_size):
+        """
+        Quantos saltos a partir de 'pos' caem obrigatoriamente dentro da região
+        antes que algum possa cair fora dela. Lados colados na borda do
+        tabuleiro não contam (não há para onde sair). math.inf se a região
+        ocupa o tabuleiro inteiro.
+        """
+        x, y = pos
+        margins = []
+        if self.x0 > 0:
+            margins.append(x - self.x0)
+        if self.x0 + self.w < board_size:
+            margins.append(self.x0 + self.w - 1 - x)
+        if self.y0 > 0:
+            margins.append(y - self.y0)
+        if self.y0 + self.h < board_size:
+            margins.append(self.y0 + self.h - 1 - y)
+        if not margins:
+            return math.inf
+        # Para cair fora é preciso andar margem + 1 casas numa coordenada.
+        return -(-(min(margins) + 1) // self.moves.reach) - 1
+
+    def __repr__(self):
+        return f"UniformRegion(x0={self.x0}, y0={self.y0}, w={self.w}, h={self.h}, cost={self.cost})"
+
+
+def find_uniform_regions(board):
+    """
+    Decompõe board.grid em retângulos de custo uniforme (de forma gulosa,
+    em ordem de linhas) e devolve:
+      - a lista de regiões com alguma casa interna (lado >= 2 * reach + 1,
+        ou seja, 5x5 para o cavalo);
+      - um dicionário posição -> região, só para as casas dessas regiões.
+    Barreiras nunca formam região.
+    """
+    grid = board.grid
+    moves = board.moves
+    # Um retângulo só tem casas internas se tiver pelo menos este lado.
+    min_side = 2 * moves.reach + 1
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    assigned = [[False] * cols for _ in range(rows)]
+
+    regions = []
+    region_of = {}
+
+    for y in range(rows):
+        for x in range(cols):
+            if assigned[y][x]:
+                continue
+            cost = grid[y][x]
+
+            # Cresce para a direita enquanto o custo for igual.
+            w = 1
+            while x + w < cols and not assigned[y][x + w] and grid[y][x + w] == cost:
+                w += 1
+
+            # Cresce para baixo enquanto a linha inteira [x, x+w) for igual.
+            h = 1
+            while y + h < rows and all(
+                not assigned[y + h][xx] and grid[y + h][xx] == cost
+                for xx in range(x, x + w)
+            ):
+                h += 1
+
+            for yy in range(y, y + h):
+                for xx in range(x, x + w):
+                    assigned[yy][xx] = True
+
+            if cost == math.inf or w < min_side or h < min_side:
+                continue
+
+            region = UniformRegion(x, y, w, h, cost, moves)
+            regions.append(region)
+            for yy in range(y, y + h):
+                for xx in range(x, x + w):
+                    region_of[(xx, yy)] = region
+
+    return regions, region_of
+
+
+@lru_cache(maxsize=1024)
+def _local_bfs(left, right, up, down, moves, horizon):
+    """
+    BFS de até 'horizon' saltos a partir de (0, 0), sem sair do retângulo
+    [-left, right] x [-up, down]. Devolve (dist, parent) em coordenadas
+    relativas à origem.
+
+    As folgas são cortadas em horizon * reach (mais longe a BFS não chega),
+    então há poucas chaves possíveis e o cache fica limitado.
+    """
+    dist = {(0, 0): 0}
+    parent = {(0, 0): None}
+    queue = deque([(0, 0)])
+    while queue:
+        cx, cy = queue.popleft()
+        d = dist[(cx, cy)]
+        if d == horizon:
+            continue
+        for dx, dy in moves.offsets:
+            nxt = (cx + dx, cy + dy)
+            if -left <= nxt[0] <= right and -up <= nxt[1] <= down and nxt not in dist:
+                dist[nxt] = d + 1
+                parent[nxt] = (cx, cy)
+                queue.append(nxt)
+    return dist, parent
+
+
+def _region_bfs(region, origin, horizon=MACRO_HORIZON):
+    """ BFS limitada de saltos dentro da região, a partir de 'origin' (relativa). """
+    span = horizon * region.moves.reach
+    x, y = origin
+    return _local_bfs(
+        min(x - region.x0, span), min(region.x0 + region.w - 1 - x, span),
+        min(y - region.y0, span), min(region.y0 + region.h - 1 - y, span),
+        region.moves, horizon,
+    )
+
+
+def _refine_macro_move(region, start, end):
+    """ Converte um macro-movimento start -> end nos saltos reais. """
+    _, parent = _region_bfs(region, start)
+    rel = (end[0] - start[0], end[1] - start[1])
+    steps = []
+    while rel is not None:
+        steps.append((start[0] + rel[0], start[1] + rel[1]))
+        rel = parent[rel]
+    return steps[::-1]
+
+
+def a_star_search_blocks(board, start_pos, end_pos, heuristic_func, regions=None):
+    """
+    A* com poda de simetria em regiões de custo uniforme (mesmo protocolo de
+    gerador que a_star_search).
+
+    Numa casa INTERNA de uma região uniforme, todos os caminhos de mesmo
+    comprimento custam o mesmo, e o A* comum expandiria várias permutações
+    equivalentes. Aqui, ao expandir uma casa interna, geramos direto um
+    macro-movimento para cada casa da região a até MACRO_HORIZON saltos que
+    seja de borda, esteja exatamente no horizonte ou seja o objetivo, com
+    custo = saltos * custo_da_região. As casas internas do meio do caminho
+    nunca entram na lista aberta. Casas de borda e casas fora de regiões usam
+    a expansão normal.
+
+    Otimalidade: todo caminho ótimo que passa por uma casa interna continua
+    dentro da região até a primeira casa de onde sai (que é de borda) ou até o
+    objetivo. Se essa casa está a até MACRO_HORIZON saltos, há macro-movimento
+    direto para ela; senão, um caminho mínimo dentro da região até ela passa
+    por uma casa exatamente no horizonte, que é gerada com o custo certo.
+
+    A heurística usada é o máximo entre 'heuristic_func' e um limite das
+    regiões: dos k saltos que faltam (step_heuristic da peça), os primeiros
+    exit_depth caem dentro da região e custam o custo dela, não min_cost.
+    Os dois são consistentes, então o máximo também é; numa região de Terra
+    com min_cost de Estrada isso corta a maior parte das expansões.
+
+    'regions' pode receber o resultado de find_uniform_regions(board) para
+    reaproveitar a decomposição entre buscas no mesmo tabuleiro.
+    """
+    if regions is None:
+        regions = find_uniform_regions(board)
+    region_list, region_of = regions
+
+    start_node = Node(start_pos)
+    end_node = Node(end_pos)
+
+    initial_h = heuristic_func(start_pos, end_pos, board.min_cost)
+    # Tabela de H só se já estiver em cache ou depois de table_threshold
+    # chamadas escalares (ver heuristics.heuristic_table).
+    h_table = heuristic_table(heuristic_func, board, end_pos, build=False)
+    scalar_calls = table_threshold(board)
+    size = board.size
+    moves = board.moves.offsets
+    min_cost = board.min_cost
+    steps_to_goal = step_heuristic(board.moves)
+
+    def region_bound(pos):
+        # Limite inferior pelos saltos que faltam (k): os primeiros
+        # exit_depth saltos caem dentro da região e custam region.cost,
+        # os demais pelo menos min_cost.
+        k = steps_to_goal(pos, end_pos, 1)
+        region = region_of.get(pos)
+        if region is None or region.cost <= min_cost:
+            return k * min_cost
+        inside = min(region.exit_depth(pos, size), k)
+        return inside * region.cost + (k - inside) * min_cost
+
+    start_node.h = initial_h
+    start_node.f = start_node.g + start_node.h
+
+    open_list = []
+    heapq.heappush(open_list, (start_node.f, start_node))
+
+    closed_set = set()
+    g_costs = {start_pos: 0}
+    nodes_expanded = 0
+
+    def relax(current_node, neighbor_pos, new_g):
+        nonlocal h_table, scalar_calls
+        if neighbor_pos not in g_costs or new_g < g_costs[neighbor_pos]:
+            g_costs[neighbor_pos] = new_g
+            if h_table is not None:
+                h = h_table[neighbor_pos[1] * size + neighbor_pos[0]]
+            else:
+                h = heuristic_func(neighbor_pos, end_pos, min_cost)
+                scalar_calls -= 1
+                if not scalar_calls:
+                    h_table = heuristic_table(heuristic_func, board, end_pos)
+            h = max(h, region_bound(neighbor_pos))
+
+            neighbor_node = Node(neighbor_pos, parent=current_node)
+            neighbor_node.g = new_g
+            neighbor_node.h = h
+            neighbor_node.f = new_g + h
+
+            heapq.heappush(open_list, (neighbor_node.f, neighbor_node))
+
+    while open_list:
+        current_f, current_node = heapq.heappop(open_list)
+
+        if current_node.position in closed_set:
+            continue
+
+        closed_set.add(current_node.position)
+        nodes_expanded += 1
+
+        yield {
+            'open': {node.position for f, node in open_list},
+            'closed': closed_set,
+            'current': current_node.position
+        }
+
+        if current_node == end_node:
+            path = _reconstruct_block_path(current_node, region_of)
+            # g das casas do caminho vem do próprio caminho: as casas internas
+            # dos macro-movimentos não tinham g, e outras podiam ter ficado com
+            # um g maior de um relaxamento anterior (mapa de calor, PathCache).
+            g = 0
+            for pos in path[1:]:
+                g += board.get_cost(pos)
+                g_costs[pos] = g
+            return path, nodes_expanded, g_costs, initial_h
+
+        region = region_of.get(current_node.position)
+
+        if region is not None and region.is_interior(current_node.position):
+            # Macro-movimentos: casa interna -> casas de borda, do horizonte
+            # e o objetivo, a até MACRO_HORIZON saltos.
+            x, y = current_node.position
+            dist, _ = _region_bfs(region, current_node.position)
+            for (dx, dy), steps in dist.items():
+                if not steps:
+                    continue
+                target = (x + dx, y + dy)
+                if steps == MACRO_HORIZON or target == end_pos or not region.is_interior(target):
+                    relax(current_node, target, current_node.g + steps * region.cost)
+            continue
+
+        # Expansão normal (borda de região, fora de região ou fronteira de terreno).
+        for move in moves:
+            neighbor_pos = (
+                current_node.position[0] + move[0],
+                current_node.position[1] + move[1]
+            )
+
+            if not board.is_valid(neighbor_pos):
+                continue
+
+            relax(current_node, neighbor_pos, current_node.g + board.get_cost(neighbor_pos))
+
+    return None, nodes_expanded, g_costs, initial_h
+
+
+def _reconstruct_block_path(end_node, region_of):
+    """
+    Reconstrói o caminho seguindo os pais e expande cada macro-movimento
+    (origem interna de uma região) nos saltos de cavalo equivalentes.
+    """
+    positions = []
+    current = end_node
+    while current is not None:
+        positions.append(current.position)
+        current = current.parent
+    positions.reverse()
+
+    path = [positions[0]]
+    for prev, pos in zip(positions, positions[1:]):
+        region = region_of.get(prev)
+        if region is not None and region.is_interior(prev):
+            path.extend(_refine_macro_move(region, prev, pos)[1:])
+        else:
+            path.append(pos)
+    return path
+
+
+# --- Comparação com o A* comum ---
+
+def benchmark_report(size=96, heuristics=(h1_chebyshev, h3_knight_unbounded), runs=2):
+    """
+    Tabuleiro size x size todo de Terra, de (1, 1) até o canto oposto: tempo
+    (melhor de 'runs'), nós expandidos e custo do a_star_search e do
+    a_star_search_blocks para cada heurística.
+    """
+    board = Board(size)
+    board._build_grid_from_map([[1] * size for _ in range(size)])
+    start, goal = (1, 1), (size - 2, size - 3)
+    rows = []
+    for heuristic in heuristics:
+        row = {"heuristic": heuristic.__name__}
+        for name, search in (("a_star", a_star_search), ("blocks", a_star_search_blocks)):
+            best = math.inf
+            for _ in range(runs):
+                t0 = time.perf_counter()
+                path, nodes, g_costs, _ = run_search(board, start, goal, heuristic, search)
+                best = min(best, time.perf_counter() - t0)
+            row[name] = {"seconds": best, "nodes": nodes, "cost": g_costs[goal] if path else None}
+        rows.append(row)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="A* por blocos contra o A* comum num tabuleiro uniforme")
+    parser.add_argument("--size", type=int, default=96)
+    args = parser.parse_args()
+
+    print("=================================================================")
+    print(f"A* POR BLOCOS — tabuleiro uniforme {args.size}x{args.size}")
+    print("=================================================================")
+    for row in benchmark_report(args.size):
+        base, block = row["a_star"], row["blocks"]
+        print(f"{row['heuristic']}: a_star {base['seconds']:.3f} s ({base['nodes']} nós) | "
+              f"blocks {block['seconds']:.3f} s ({block['nodes']} nós) | "
+              f"aceleração {base['seconds'] / block['seconds']:.1f}x")
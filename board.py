@@ -3,33 +3,114 @@
 import math
 import random
 
+
+class MoveSet:
+    """
+    Conjunto de saltos de uma peça "saltadora" (cavalo, camelo, zebra, ...).
+    É montado uma vez e guardado no Board; as buscas só percorrem 'offsets'.
+    """
+    def __init__(self, name, offsets):
+        self.name = name
+        self.offsets = tuple(offsets)
+        # Maior deslocamento numa coordenada / na soma das duas, num salto.
+        self.reach = max(max(abs(dx), abs(dy)) for dx, dy in self.offsets)
+        self.max_manhattan = max(abs(dx) + abs(dy) for dx, dy in self.offsets)
+
+    def min_steps(self, dx, dy):
+        """
+        Limite inferior do número de saltos para andar (dx, dy) num tabuleiro
+        vazio: cada salto reduz a distância de Chebyshev em no máximo 'reach'
+        e a de Manhattan em no máximo 'max_manhattan'.
+        """
+        dx, dy = abs(dx), abs(dy)
+        return max(-(-max(dx, dy) // self.reach), -(-(dx + dy) // self.max_manhattan))
+
+    def __eq__(self, other):
+        return isinstance(other, MoveSet) and self.offsets == other.offsets
+
+    def __hash__(self):
+        return hash(self.offsets)
+
+    def __repr__(self):
+        return f"MoveSet({self.name!r})"
+
+
+def leaper(m, n):
+    """ Os 8 saltos (±m, ±n) e (±n, ±m) de uma peça saltadora (m, n). """
+    offsets = []
+    for a, b in ((m, n), (n, m)):
+        for sa in (1, -1):
+            for sb in (1, -1):
+                if (sa * a, sb * b) not in offsets:
+                    offsets.append((sa * a, sb * b))
+    return offsets
+
+
+KNIGHT = MoveSet("Cavalo", leaper(1, 2))
+CAMEL = MoveSet("Camelo", leaper(1, 3))
+ZEBRA = MoveSet("Zebra", leaper(2, 3))
+KING_KNIGHT = MoveSet("Rei+Cavalo", leaper(1, 2) + leaper(0, 1) + leaper(1, 1))
+
+MOVE_SETS = {m.name: m for m in (KNIGHT, CAMEL, ZEBRA, KING_KNIGHT)}
+
+
+class TerrainModel:
+    """
+    Tabela de terrenos: nome -> custo de entrar na casa (math.inf = barreira),
+    na ordem dos códigos usados nos mapas (0, 1, 2, ...), e as probabilidades
+    de cada terreno no sorteio de mapas.
+    """
+    def __init__(self, costs, weights=None):
+        self.costs = dict(costs)
+        self.weights = list(weights) if weights is not None else [1.0] * len(self.costs)
+        if len(self.weights) != len(self.costs):
+            raise ValueError("Uma probabilidade por terreno")
+
+
+# Terrenos do jogo. Probabilidades: Estrada 30%, Terra 40%, Lama 20%, Barreira 10%
+DEFAULT_TERRAIN = TerrainModel(
+    {
+        "Estrada": 0.5,
+        "Terra": 1.0,
+        "Lama": 5.0,
+        "Barreira": math.inf
+    },
+    weights=[0.3, 0.4, 0.2, 0.1],
+)
+
+
 class Board:
-    def __init__(self):
+    def __init__(self, size=8, terrain=DEFAULT_TERRAIN, moves=KNIGHT):
         # Define os custos de terreno. Usamos 'inf' (infinito) para barreiras.
-        self.costs = {
-            "Estrada": 0.5,
-            "Terra": 1.0,
-            "Lama": 5.0,
-            "Barreira": math.inf
-        }
+        self.terrain = terrain
+        self.costs = dict(terrain.costs)
+
+        # Saltos permitidos (cavalo por padrão).
+        self.moves = moves
         
+        # Lado do tabuleiro (8 no jogo; maior para testes de desempenho).
+        self.size = size
+
+        # Versão do terreno: aumenta a cada mudança no grid, para quem guarda
+        # resultados calculados em cima dele (caches) saber que ficaram velhos.
+        self.version = 0
+
         # Um exemplo de tabuleiro 8x8.
         # 0: Estrada, 1: Terra, 2: Lama, 3: Barreira
-        terrain_map = self._generate_random_map()
+        terrain_map = self._generate_random_map(size)
         
         # Converte o mapa de terrenos para um mapa de custos reais
+        # (cost_table[código] = custo, montada uma vez por tabuleiro)
         self.terrain_types = list(self.costs.keys())
-        self.grid = [
-            [self.costs[self.terrain_types[terrain_map[y][x]]] for x in range(8)]
-            for y in range(8)
-        ]
+        self.cost_table = [self.costs[t] for t in self.terrain_types]
+        self._build_grid_from_map(terrain_map)
         
         # O menor custo possível em uma casa transitável (será útil para a heurística)
         self.min_cost = min(c for c in self.costs.values() if c != math.inf)
 
     def _generate_random_map(self, size=8):
         """
-        Gera um mapa de terrenos aleatório 8x8.
+        Gera um mapa de terrenos aleatório size x size.
         0: Estrada (0.5)
         1: Terra (1.0)
         2: Lama (5.0)
@@ -37,15 +118,13 @@ class Board:
         """
         terrain_map = []
         for _ in range(size):
-            row = []
-            for _ in range(size):
-                # Probabilidades: Estrada 30%, Terra 40%, Lama 20%, Barreira 10%
-                choice = random.choices(
-                    population=[0, 1, 2, 3],
-                    weights=[0.3, 0.4, 0.2, 0.1],
-                    k=1
-                )[0]
-                row.append(choice)
+            # Probabilidades vêm do modelo de terreno
+            # (sorteia a linha inteira de uma vez; importa em tabuleiros grandes)
+            row = random.choices(
+                population=range(len(self.terrain.weights)),
+                weights=self.terrain.weights,
+                k=size
+            )
             terrain_map.append(row)
         return terrain_map
 
@@ -57,8 +136,8 @@ class Board:
     def is_valid(self, position):
         """ Verifica se uma posição (x, y) está dentro do tabuleiro e não é uma barreira. """
         x, y = position
-        # Verifica se está dentro dos limites (0 a 7)
-        if not (0 <= x < 8 and 0 <= y < 8):
+        # Verifica se está dentro dos limites (0 a size-1)
+        if not (0 <= x < self.size and 0 <= y < self.size):
             return False
         # Verifica se não é uma barreira
         if self.grid[y][x] == math.inf:
@@ -70,9 +149,19 @@ class Board:
         Refaz o tabuleiro com um novo mapa aleatório.
         Mantém os mesmos custos definidos em self.costs.
         """
-        terrain_map = self._generate_random_map()
+        terrain_map = self._generate_random_map(self.size)
         self._build_grid_from_map(terrain_map)
 
+    def set_terrain(self, position, terrain):
+        """
+        Troca o terreno de uma única casa (x, y), por nome ("Estrada", "Lama", ...).
+        Planejadores com tabelas pré-calculadas (ex.: HierarchicalPlanner)
+        devem ser avisados das casas alteradas.
+        """
+        x, y = position
+        self.grid[y][x] = self.costs[terrain]
+        self.version += 1
+
     def _build_grid_from_map(self, terrain_map):
         """
                 Converte o mapa de inteiros (0,1,2,3) em uma grade de custos reais.
@@ -80,10 +169,12 @@ class Board:
                   0 -> Estrada -> 0.5
                   3 -> Barreira -> math.inf
                 """
+        cost_table = self.cost_table
         self.grid = [
             [
-                self.costs[self.terrain_types[terrain_map[y][x]]]
-                for x in range(8)
+                cost_table[terrain_map[y][x]]
+                for x in range(self.size)
             ]
-            for y in range(8)
-        ]
\ No newline at end of file
+            for y in range(self.size)
+        ]
+        self.version += 1
\ No newline at end of file
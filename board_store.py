@@ -0,0 +1,186 @@
+# board_store.py
+"""
+Formato em disco (versionado) para o terreno de um Board e tabelas derivadas
+(campos de distância, tabelas de landmarks, rótulos de componentes, ...).
+
+Layout do arquivo:
+    [prefixo fixo]  magic (8 bytes) | versão (uint32) | tamanho do cabeçalho (uint32)
+    [cabeçalho]     JSON com size, custos dos terrenos, saltos da peça
+                    (moves: nome e offsets), byteorder e o diretório de
+                    tabelas {nome: {offset, typecode, length}}
+    [dados]         seções alinhadas em 8 bytes; o terreno fica na tabela
+                    "grid" como float64 (custo de cada casa, linha a linha)
+
+load_board() só lê o prefixo e o cabeçalho; o resto é acessado direto pelo
+mmap (zero cópia), então o tempo de carga não depende do tamanho do tabuleiro
+e vários processos podem abrir o mesmo arquivo somente-leitura, dividindo as
+mesmas páginas do cache do sistema.
+"""
+import array
+import json
+import math
+import mmap
+import struct
+import sys
+
+from board import Board, KNIGHT, MoveSet
+
+MAGIC = b"KNBOARD\0"
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<8sII")
+_ALIGN = 8
+
+
+def _encode_cost(cost):
+    # JSON não tem infinito; a Barreira é gravada como string.
+    return "inf" if cost == math.inf else cost
+
+
+def _decode_cost(cost):
+    return math.inf if cost == "inf" else cost
+
+
+def save_board(board, path, tables=None):
+    """
+    Grava o terreno de 'board' e as tabelas derivadas em 'path'.
+    'tables' é um dicionário nome -> array.array (o typecode é preservado)
+    ou lista de números (gravada como float64).
+    """
+    cells = array.array("d", (cost for row in board.grid for cost in row))
+    sections = {"grid": cells}
+    for name, values in (tables or {}).items():
+        if name in sections:
+            raise ValueError(f"Nome de tabela reservado: {name!r}")
+        sections[name] = values if isinstance(values, array.array) else array.array("d", values)
+
+    # Primeiro monta o diretório com offsets relativos ao início dos dados.
+    directory = {}
+    offset = 0
+    for name, values in sections.items():
+        directory[name] = {"offset": offset, "typecode": values.typecode, "length": len(values)}
+        offset += len(values) * values.itemsize
+        offset += -offset % _ALIGN
+
+    header = json.dumps({
+        "size": board.size,
+        "costs": {name: _encode_cost(c) for name, c in board.costs.items()},
+        "moves": {"name": board.moves.name, "offsets": [list(o) for o in board.moves.offsets]},
+        "byteorder": sys.byteorder,
+        "tables": directory,
+    }).encode("utf-8")
+    # Alinha o início dos dados.
+    header += b" " * (-(_PREFIX.size + len(header)) % _ALIGN)
+    data_start = _PREFIX.size + len(header)
+
+    with open(path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for name, values in sections.items():
+            f.seek(data_start + directory[name]["offset"])
+            values.tofile(f)
+        f.truncate(data_start + offset)
+
+
+class _MappedGrid:
+    """
+    Imita a lista de listas Board.grid em cima do buffer mapeado:
+    grid[y] devolve a linha como memoryview (sem copiar) e grid[y][x] o custo.
+    """
+    def __init__(self, cells, size):
+        self._cells = cells
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, y):
+        if not 0 <= y < self._size:
+            raise IndexError(y)
+        return self._cells[y * self._size:(y + 1) * self._size]
+
+
+class MappedBoard(Board):
+    """
+    Board somente-leitura carregado de um arquivo de save_board().
+    O terreno e as tabelas ficam no mmap; nada é copiado para listas Python.
+    """
+    def __init__(self, path):
+        # Não chama Board.__init__: o terreno vem do arquivo, não é sorteado.
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_len = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: não é um arquivo de tabuleiro")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path}: versão {version} não suportada (esperada {FORMAT_VERSION})")
+
+        header = json.loads(self._mmap[_PREFIX.size:_PREFIX.size + header_len])
+        if header["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError(f"{path}: gravado em máquina {header['byteorder']}-endian")
+
+        self.size = header["size"]
+        self.version = 0  # somente leitura: o terreno nunca muda
+        self.costs = {name: _decode_cost(c) for name, c in header["costs"].items()}
+        self.terrain_types = list(self.costs.keys())
+        self.min_cost = min(c for c in self.costs.values() if c != math.inf)
+        # Arquivos sem "moves" são de antes dos conjuntos de saltos: cavalo.
+        moves = header.get("moves")
+        self.moves = MoveSet(moves["name"], map(tuple, moves["offsets"])) if moves else KNIGHT
+
+        data_start = _PREFIX.size + header_len
+        raw = memoryview(self._mmap)
+        self.tables = {}
+        for name, entry in header["tables"].items():
+            start = data_start + entry["offset"]
+            nbytes = entry["length"] * array.array(entry["typecode"]).itemsize
+            self.tables[name] = raw[start:start + nbytes].cast(entry["typecode"])
+
+        self._cells = self.tables.pop("grid")
+        self.grid = _MappedGrid(self._cells, self.size)
+
+    # Acesso direto ao buffer, sem passar pela linha de grid.
+    def get_cost(self, position):
+        x, y = position
+        return self._cells[y * self.size + x]
+
+    def is_valid(self, position):
+        x, y = position
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return False
+        return self._cells[y * self.size + x] != math.inf
+
+    def randomize(self):
+        raise ValueError("Tabuleiro mapeado é somente leitura")
+
+    def set_terrain(self, position, terrain):
+        raise ValueError("Tabuleiro mapeado é somente leitura")
+
+    def close(self):
+        """
+        Solta as views e fecha o mmap e o arquivo. Linhas de grid ou tabelas
+        guardadas fora do board precisam ser liberadas antes (senão o mmap
+        levanta BufferError).
+        """
+        self.tables = {}
+        self._cells = None
+        self.grid = None
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_board(path):
+    """ Abre um arquivo de save_board() como MappedBoard (mmap, zero cópia). """
+    return MappedBoard(path)
@@ -0,0 +1,262 @@
+# compact_search.py
+"""
+A* com pouca memória para tabuleiros grandes.
+
+O a_star_search guarda g num dict de tuplas, a lista fechada num set de
+tuplas e a lista aberta num heap de (float, Node): na prática passa de 200
+bytes por casa visitada. Aqui tudo fica em arrays indexados por
+y * size + x, alocados uma vez por busca:
+
+    g                array('d')  8 bytes por casa
+    posição no heap  array('i')  4 bytes por casa (-1 = fora da lista aberta)
+    lista fechada    bitset      1 bit por casa
+    lista aberta     heap binário com decrease-key em dois arrays paralelos
+                     (f: 'd', casa: 'i'), 12 bytes por casa ABERTA
+
+Ou seja, cerca de 12 bytes por casa do tabuleiro mais 12 por casa na
+fronteira, perto de 16 bytes por casa na prática. Não há array de pais: o
+caminho é refeito do objetivo para trás, escolhendo a vizinha fechada com
+g[vizinha] + custo(casa) == g[casa] (a soma é a mesma conta feita na busca,
+então a igualdade é exata), sem repetir casas (terrenos de custo zero).
+
+Mesmo protocolo de gerador das outras buscas. Os estados emitidos e o g_costs
+devolvido são "vistas" sobre os arrays (aceitam 'in', len(), iteração e
+.copy()), em vez de sets e dicts montados a cada passo. A heurística é
+sempre chamada por casa: uma tabela de heuristic_table() (8 bytes por casa)
+sozinha já seria metade da memória da busca.
+"""
+import array
+import math
+from collections.abc import Mapping
+
+
+class CellSet:
+    """ Conjunto de casas (x, y) sobre um bitset (1 bit por casa). """
+    def __init__(self, bits, size):
+        self._bits = bits
+        self._size = size
+
+    def __contains__(self, pos):
+        x, y = pos
+        if not (0 <= x < self._size and 0 <= y < self._size):
+            return False
+        i = y * self._size + x
+        return bool(self._bits[i >> 3] & (1 << (i & 7)))
+
+    def __iter__(self):
+        size = self._size
+        for byte_index, byte in enumerate(self._bits):
+            while byte:
+                low = byte & -byte
+                i = (byte_index << 3) + low.bit_length() - 1
+                yield (i % size, i // size)
+                byte ^= low
+
+    def __len__(self):
+        return int.from_bytes(self._bits, "little").bit_count()
+
+    def copy(self):
+        return CellSet(bytearray(self._bits), self._size)
+
+
+class OpenCells:
+    """ Vista das casas na lista aberta (o heap da busca). """
+    def __init__(self, heap_cells, heap_pos, size):
+        self._cells = heap_cells
+        self._pos = heap_pos
+        self._size = size
+
+    def __contains__(self, pos):
+        x, y = pos
+        if not (0 <= x < self._size and 0 <= y < self._size):
+            return False
+        return self._pos[y * self._size + x] >= 0
+
+    def __iter__(self):
+        size = self._size
+        for i in self._cells:
+            yield (i % size, i // size)
+
+    def __len__(self):
+        return len(self._cells)
+
+    def copy(self):
+        """ Cópia congelada como bitset (1 bit por casa, não importa a fronteira). """
+        bits = bytearray((self._size * self._size + 7) // 8)
+        for i in self._cells:
+            bits[i >> 3] |= 1 << (i & 7)
+        return CellSet(bits, self._size)
+
+
+class CompactCosts(Mapping):
+    """ g_costs como Mapping (x, y) -> g sobre o array('d'); inf = não visitada. """
+    def __init__(self, g, size):
+        self._g = g
+        self._size = size
+
+    def __getitem__(self, pos):
+        x, y = pos
+        if 0 <= x < self._size and 0 <= y < self._size:
+            value = self._g[y * self._size + x]
+            if value != math.inf:
+                return value
+        raise KeyError(pos)
+
+    def __iter__(self):
+        size = self._size
+        for i, value in enumerate(self._g):
+            if value != math.inf:
+                yield (i % size, i // size)
+
+    def __len__(self):
+        return sum(1 for value in self._g if value != math.inf)
+
+    def copy(self):
+        return CompactCosts(array.array("d", self._g), self._size)
+
+
+def a_star_search_compact(board, start_pos, end_pos, heuristic_func):
+    """
+    A* com arrays tipados e bitset (ver o topo do módulo). Devolve a mesma
+    tupla final (path, nodes_expanded, g_costs, initial_h), com g_costs
+    sendo um CompactCosts.
+    """
+    size = board.size
+    n = size * size
+    moves = board.moves.offsets
+    min_cost = board.min_cost
+
+    g = array.array("d", [math.inf]) * n
+    heap_pos = array.array("i", [-1]) * n
+    closed = bytearray((n + 7) // 8)
+    heap_f = array.array("d")
+    heap_cells = array.array("i")
+
+    open_view = OpenCells(heap_cells, heap_pos, size)
+    closed_view = CellSet(closed, size)
+    g_costs = CompactCosts(g, size)
+
+    def sift_up(k):
+        f, cell = heap_f[k], heap_cells[k]
+        while k > 0:
+            parent = (k - 1) >> 1
+            if heap_f[parent] <= f:
+                break
+            heap_f[k] = heap_f[parent]
+            heap_cells[k] = heap_cells[parent]
+            heap_pos[heap_cells[k]] = k
+            k = parent
+        heap_f[k] = f
+        heap_cells[k] = cell
+        heap_pos[cell] = k
+
+    def pop_min():
+        cell = heap_cells[0]
+        heap_pos[cell] = -1
+        last_f, last_cell = heap_f.pop(), heap_cells.pop()
+        count = len(heap_cells)
+        if count:
+            # Desce a última entrada a partir da raiz.
+            k = 0
+            while True:
+                child = 2 * k + 1
+                if child >= count:
+                    break
+                if child + 1 < count and heap_f[child + 1] < heap_f[child]:
+                    child += 1
+                if heap_f[child] >= last_f:
+                    break
+                heap_f[k] = heap_f[child]
+                heap_cells[k] = heap_cells[child]
+                heap_pos[heap_cells[k]] = k
+                k = child
+            heap_f[k] = last_f
+            heap_cells[k] = last_cell
+            heap_pos[last_cell] = k
+        return cell
+
+    initial_h = heuristic_func(start_pos, end_pos, min_cost)
+    start = start_pos[1] * size + start_pos[0]
+    goal = end_pos[1] * size + end_pos[0]
+    g[start] = 0
+    heap_f.append(initial_h)
+    heap_cells.append(start)
+    heap_pos[start] = 0
+    nodes_expanded = 0
+
+    while heap_cells:
+        current = pop_min()
+        closed[current >> 3] |= 1 << (current & 7)
+        nodes_expanded += 1
+        x, y = current % size, current // size
+
+        yield {'open': open_view, 'closed': closed_view, 'current': (x, y)}
+
+        if current == goal:
+            return _reconstruct(board, g, closed, start, goal), nodes_expanded, g_costs, initial_h
+
+        current_g = g[current]
+        for dx, dy in moves:
+            nx, ny = x + dx, y + dy
+            if not board.is_valid((nx, ny)):
+                continue
+            neighbor = ny * size + nx
+            if closed[neighbor >> 3] & (1 << (neighbor & 7)):
+                continue
+            new_g = current_g + board.get_cost((nx, ny))
+            if new_g < g[neighbor]:
+                g[neighbor] = new_g
+                f = new_g + heuristic_func((nx, ny), end_pos, min_cost)
+                k = heap_pos[neighbor]
+                if k < 0:
+                    k = len(heap_cells)
+                    heap_f.append(f)
+                    heap_cells.append(neighbor)
+                else:
+                    # decrease-key: g só diminui, e h da casa é o mesmo.
+                    heap_f[k] = f
+                sift_up(k)
+
+    return None, nodes_expanded, g_costs, initial_h
+
+
+def _reconstruct(board, g, closed, start, goal):
+    """
+    Refaz o caminho do objetivo até o início seguindo g (sem array de pais):
+    de cada casa volta para uma vizinha fechada com g[vizinha] + custo == g.
+    É uma busca em profundidade com 'visited': com custos positivos g cai a
+    cada passo e a primeira escolha sempre chega ao início, mas com terreno
+    de custo zero duas casas podem ter o mesmo g e a volta precisa evitar
+    ciclos (e recuar se entrar num beco).
+    """
+    size = board.size
+    offsets = board.moves.offsets
+    n_moves = len(offsets)
+
+    cells = [goal]
+    tried = [0]          # próximo salto a testar em cada casa do caminho
+    visited = {goal}
+    while cells[-1] != start:
+        cell = cells[-1]
+        x, y = cell % size, cell // size
+        cost = board.get_cost((x, y))
+        while tried[-1] < n_moves:
+            dx, dy = offsets[tried[-1]]
+            tried[-1] += 1
+            px, py = x - dx, y - dy
+            if not (0 <= px < size and 0 <= py < size):
+                continue
+            prev = py * size + px
+            if (prev not in visited and closed[prev >> 3] & (1 << (prev & 7))
+                    and g[prev] + cost == g[cell]):
+                visited.add(prev)
+                cells.append(prev)
+                tried.append(0)
+                break
+        else:
+            # Beco sem saída (só com custo zero): recua uma casa.
+            cells.pop()
+            tried.pop()
+            if not cells:
+                raise AssertionError(f"sem caminho de volta de {(goal % size, goal // size)}")
+    return [(cell % size, cell // size) for cell in reversed(cells)]
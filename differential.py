@@ -0,0 +1,386 @@
+# differential.py
+"""
+Teste diferencial entre TODOS os motores de busca e heurísticas.
+
+Gera tabuleiros com semente fixa (tamanhos, densidade de barreiras, tabelas
+de custo e peças saltadoras variados) e confere que cada combinação motor x heurística devolve
+um caminho válido com o mesmo custo ótimo de um Dijkstra de referência,
+escrito aqui de forma independente, e um g_costs[objetivo] igual a esse custo
+(o planejador hierárquico é quase ótimo: só não pode ficar abaixo do ótimo). Casos que falham são reduzidos
+(shrinking) até um tabuleiro mínimo que ainda falha.
+
+Roda em paralelo (um processo por núcleo) dentro de um orçamento de tempo:
+    python differential.py --budget 60 --workers 4
+"""
+import argparse
+import heapq
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from board import Board, KNIGHT, MOVE_SETS, TerrainModel
+from a_star import a_star_search, run_search
+from block_search import a_star_search_blocks
+from compact_search import a_star_search_compact
+from heuristics import h1_chebyshev, h2_knight_distance, h3_knight_unbounded, step_heuristic
+from hierarchical import HierarchicalPlanner
+from parallel_search import hda_star_search
+from path_cache import PathCache
+
+# --- Geração de casos ---
+
+def generate_case(seed):
+    """ Caso aleatório e reproduzível a partir da semente. """
+    rng = random.Random(seed)
+    size = rng.choice([3, 4, 5, 6, 7, 8, 8, 8, 10, 12, 16])
+    # Metade dos casos com o cavalo; o resto com as outras peças.
+    moves = KNIGHT.name if rng.random() < 0.5 else rng.choice(sorted(MOVE_SETS))
+
+    costs = {
+        "Estrada": rng.choice([0.5, 0.25, 1.0, round(rng.uniform(0.1, 2.0), 2)]),
+        "Terra": rng.choice([1.0, 2.0, round(rng.uniform(0.5, 4.0), 2)]),
+        "Lama": rng.choice([5.0, 3.0, round(rng.uniform(1.0, 20.0), 2)]),
+        "Barreira": math.inf,
+    }
+    barrier = rng.choice([0.0, 0.1, 0.25, 0.4])
+    weights = [rng.random() for _ in range(3)]
+    total = sum(weights)
+    weights = [w / total * (1 - barrier) for w in weights] + [barrier]
+    terrain_map = [rng.choices(range(4), weights=weights, k=size) for _ in range(size)]
+
+    # Às vezes pinta um bloco uniforme grande (exercita a poda por regiões).
+    if size >= 5 and rng.random() < 0.4:
+        w, h = rng.randint(5, size), rng.randint(5, size)
+        x0, y0 = rng.randint(0, size - w), rng.randint(0, size - h)
+        fill = rng.randint(0, 2)
+        for y in range(y0, y0 + h):
+            for x in range(x0, x0 + w):
+                terrain_map[y][x] = fill
+
+    case = {"seed": seed, "size": size, "costs": costs, "moves": moves, "terrain_map": terrain_map}
+    valid = _valid_cells(case)
+    if len(valid) < 2:
+        return None
+    case["start"], case["goal"] = rng.sample(valid, 2)
+    return case
+
+
+def _valid_cells(case):
+    return [(x, y) for y in range(case["size"]) for x in range(case["size"])
+            if case["terrain_map"][y][x] != 3]
+
+
+def build_board(case):
+    """ Board com o mapa, a tabela de custos e a peça do caso. """
+    board = Board(case["size"], terrain=TerrainModel(case["costs"]),
+                  moves=MOVE_SETS[case.get("moves", KNIGHT.name)])
+    board._build_grid_from_map(case["terrain_map"])
+    return board
+
+
+# --- Referência ---
+
+def reference_cost(board, start_pos, end_pos):
+    """ Dijkstra simples, sem heurística e sem nada compartilhado com os motores. """
+    dist = {start_pos: 0}
+    heap = [(0, start_pos)]
+    while heap:
+        d, pos = heapq.heappop(heap)
+        if pos == end_pos:
+            return d
+        if d > dist[pos]:
+            continue
+        for dx, dy in board.moves.offsets:
+            nxt = (pos[0] + dx, pos[1] + dy)
+            if board.is_valid(nxt):
+                nd = d + board.get_cost(nxt)
+                if nd < dist.get(nxt, math.inf):
+                    dist[nxt] = nd
+                    heapq.heappush(heap, (nd, nxt))
+    return math.inf
+
+
+def random_pairs(board, rng, n):
+    """ n pares (início, objetivo) de casas transitáveis distintas, sorteados com rng. """
+    valid = [(x, y) for y in range(board.size) for x in range(board.size) if board.is_valid((x, y))]
+    return [tuple(rng.sample(valid, 2)) for _ in range(n)]
+
+
+def path_cost(board, path):
+    """
+    Custo de um caminho (custo de entrada de cada casa, menos a inicial).
+    Levanta ValueError se algum passo não é um salto da peça do tabuleiro
+    (board.moves.offsets) para uma casa transitável.
+    """
+    for a, b in zip(path, path[1:]):
+        if (b[0] - a[0], b[1] - a[1]) not in board.moves.offsets or not board.is_valid(b):
+            raise ValueError(f"salto inválido {a} -> {b}")
+    return sum(board.get_cost(p) for p in path[1:])
+
+
+def result_error(board, start, goal, result, expected=None, exact=True):
+    """
+    Confere a tupla final (path, nodes, g_costs, initial_h) de uma busca de
+    start até goal contra o custo ótimo 'expected' (padrão: reference_cost):
+    caminho válido achado sempre que existe, com esse custo (com
+    exact=False, só não pode ficar abaixo dele), e g_costs[goal] igual ao
+    custo do caminho. Devolve None se está certo, ou uma string com o erro.
+    """
+    if expected is None:
+        expected = reference_cost(board, start, goal)
+    path, _, g_costs, _ = result
+
+    if path is None:
+        return None if expected == math.inf else f"sem caminho, esperado {expected}"
+    if expected == math.inf:
+        return "achou caminho onde não existe"
+    if path[0] != start or path[-1] != goal:
+        return f"caminho não liga {start} a {goal}"
+    try:
+        cost = path_cost(board, path)
+    except ValueError as e:
+        return str(e)
+    if not exact:
+        if cost < expected and not math.isclose(cost, expected, rel_tol=1e-9, abs_tol=1e-9):
+            return f"custo {cost} abaixo do ótimo {expected}"
+    elif not math.isclose(cost, expected, rel_tol=1e-9, abs_tol=1e-9):
+        return f"custo {cost}, ótimo {expected}"
+    # O g devolvido para o objetivo (mapa de calor, PathCache) tem que bater
+    # com o custo do caminho.
+    goal_g = g_costs.get(goal, math.inf)
+    if not math.isclose(goal_g, cost, rel_tol=1e-9, abs_tol=1e-9):
+        return f"g_costs[objetivo] = {goal_g}, custo do caminho {cost}"
+    return None
+
+
+# --- Motores ---
+
+# Cada motor devolve a tupla final das buscas: (path, nodes, g_costs, initial_h).
+
+def _engine_a_star(board, start, goal, h):
+    return run_search(board, start, goal, h, a_star_search)
+
+
+def _engine_blocks(board, start, goal, h):
+    return run_search(board, start, goal, h, a_star_search_blocks)
+
+
+def _engine_compact(board, start, goal, h):
+    return run_search(board, start, goal, h, a_star_search_compact)
+
+
+def _engine_hierarchical(board, start, goal, h):
+    planner = HierarchicalPlanner(board, cluster_size=max(3, board.size // 2))
+    return planner.find_path(start, goal, h)
+
+
+def _engine_cached(board, start, goal, h):
+    # Segunda consulta sai do cache; tem que devolver o mesmo caminho ótimo.
+    search = PathCache(board).wrap(a_star_search)
+    run_search(board, start, goal, h, search)
+    return run_search(board, start, goal, h, search)
+
+
+def _engine_hda(board, start, goal, h):
+    return hda_star_search(board, start, goal, h, workers=2)
+
+
+# Motores quase ótimos por projeto (o HPA* só passa pelo corredor escolhido
+# no grafo abstrato): o caminho tem que ser válido e achado sempre que existe,
+# mas o custo só não pode ficar abaixo do ótimo.
+NEAR_OPTIMAL = {"hierarchical"}
+
+# nome -> (função, roda a cada N casos). O HDA* sobe processos, então é
+# amostrado para não dominar o orçamento de tempo.
+ENGINES = {
+    "a_star": (_engine_a_star, 1),
+    "blocks": (_engine_blocks, 1),
+    "compact": (_engine_compact, 1),
+    "hierarchical": (_engine_hierarchical, 1),
+    "cached": (_engine_cached, 1),
+    "hda": (_engine_hda, 10),
+}
+
+HEURISTICS = {
+    "H1": h1_chebyshev,
+    "H2": h2_knight_distance,
+    "H3": h3_knight_unbounded,
+}
+
+
+def _heuristics_for(case):
+    # H2 e H3 são do cavalo, e a H2 só é admissível em tabuleiros de até 8x8.
+    # "HS" é a heurística de saltos da peça do caso (step_heuristic).
+    moves = case.get("moves", KNIGHT.name)
+    if moves != KNIGHT.name:
+        return ["H1", "HS"]
+    return [name for name in HEURISTICS if name != "H2" or case["size"] <= 8] + ["HS"]
+
+
+def _heuristic(case, name):
+    if name == "HS":
+        return step_heuristic(MOVE_SETS[case.get("moves", KNIGHT.name)])
+    return HEURISTICS[name]
+
+
+# --- Verificação ---
+
+def check(case, engine_name, heuristic_name, engines=None):
+    """ Devolve None se o motor acertou, ou uma string descrevendo o erro. """
+    engine = (engines or ENGINES)[engine_name][0]
+    board = build_board(case)
+    start, goal = tuple(case["start"]), tuple(case["goal"])
+    expected = reference_cost(board, start, goal)
+
+    try:
+        result = engine(board, start, goal, _heuristic(case, heuristic_name))
+    except Exception as e:
+        return f"exceção {type(e).__name__}: {e}"
+    return result_error(board, start, goal, result, expected, exact=engine_name not in NEAR_OPTIMAL)
+
+
+def check_case(case, engines=None):
+    """ Todas as combinações motor x heurística de um caso. Devolve as falhas. """
+    engines = engines or ENGINES
+    failures = []
+    for engine_name, (_, every) in engines.items():
+        if case["seed"] % every:
+            continue
+        for heuristic_name in _heuristics_for(case):
+            error = check(case, engine_name, heuristic_name, engines)
+            if error is not None:
+                failures.append((engine_name, heuristic_name, error))
+    return failures
+
+
+# --- Shrinking ---
+
+def _crop(case, x0, y0, size):
+    start = (case["start"][0] - x0, case["start"][1] - y0)
+    goal = (case["goal"][0] - x0, case["goal"][1] - y0)
+    if not all(0 <= c < size for c in start + goal):
+        return None
+    return dict(case, size=size, start=start, goal=goal,
+                terrain_map=[row[x0:x0 + size] for row in case["terrain_map"][y0:y0 + size]])
+
+
+def _candidates(case):
+    """ Versões "menores" do caso, da redução mais forte para a mais fraca. """
+    size = case["size"]
+    # 1. Tabuleiro uma casa menor (tira uma linha e uma coluna das bordas).
+    if size > 3:
+        for x0 in (0, 1):
+            for y0 in (0, 1):
+                cropped = _crop(case, x0, y0, size - 1)
+                if cropped is not None:
+                    yield cropped
+    # 2. Casas mais simples: barreira/lama/estrada viram terra.
+    for y in range(size):
+        for x in range(size):
+            if case["terrain_map"][y][x] != 1 and (x, y) not in (tuple(case["start"]), tuple(case["goal"])):
+                terrain_map = [row[:] for row in case["terrain_map"]]
+                terrain_map[y][x] = 1
+                yield dict(case, terrain_map=terrain_map)
+    # 3. Custos "redondos".
+    for name, simple in (("Estrada", 0.5), ("Terra", 1.0), ("Lama", 5.0)):
+        if case["costs"][name] != simple:
+            yield dict(case, costs=dict(case["costs"], **{name: simple}))
+
+
+def shrink(case, engine_name, heuristic_name, engines=None, max_steps=2000, deadline=None):
+    """
+    Reduz gulosamente o caso enquanto a mesma combinação continuar falhando.
+    Para em max_steps verificações ou quando time.time() passa de 'deadline'
+    (devolve o menor caso achado até ali).
+    """
+    steps = 0
+    improved = True
+    while improved and steps < max_steps:
+        improved = False
+        for candidate in _candidates(case):
+            if deadline is not None and time.time() >= deadline:
+                return case
+            steps += 1
+            if check(candidate, engine_name, heuristic_name, engines) is not None:
+                case = candidate
+                improved = True
+                break
+            if steps >= max_steps:
+                break
+    return case
+
+
+# --- Execução paralela com orçamento de tempo ---
+
+def _run_slice(worker, workers, seed, deadline):
+    cases = 0
+    failures = []
+    i = worker
+    while time.time() < deadline:
+        case = generate_case(seed + i)
+        i += workers
+        if case is None:
+            continue
+        cases += 1
+        for engine_name, heuristic_name, error in check_case(case):
+            small = shrink(case, engine_name, heuristic_name, deadline=deadline)
+            failures.append({
+                "seed": case["seed"], "engine": engine_name, "heuristic": heuristic_name,
+                "error": error, "shrunk": small,
+            })
+    return cases, failures
+
+
+def run_harness(budget_seconds=60, workers=None, seed=0):
+    """
+    Roda casos com sementes seed, seed+1, ... em 'workers' processos até o
+    orçamento acabar. Devolve {"cases": n, "failures": [...]}.
+    """
+    workers = workers or os.cpu_count() or 1
+    deadline = time.time() + budget_seconds
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_run_slice, w, workers, seed, deadline) for w in range(workers)]
+        results = [f.result() for f in futures]
+    return {
+        "cases": sum(n for n, _ in results),
+        "failures": [f for _, fails in results for f in fails],
+    }
+
+
+def format_case(case):
+    """ Mapa do caso em texto (E/T/L/#), com S no início e G no objetivo. """
+    letters = "ETL#"
+    lines = [f"size={case['size']} moves={case.get('moves', KNIGHT.name)} costs={case['costs']} "
+             f"start={case['start']} goal={case['goal']}"]
+    for y, row in enumerate(case["terrain_map"]):
+        cells = []
+        for x, t in enumerate(row):
+            if (x, y) == tuple(case["start"]):
+                cells.append("S")
+            elif (x, y) == tuple(case["goal"]):
+                cells.append("G")
+            else:
+                cells.append(letters[t])
+        lines.append(" ".join(cells))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste diferencial entre motores de busca")
+    parser.add_argument("--budget", type=float, default=60, help="segundos")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = run_harness(args.budget, args.workers, args.seed)
+    print("=================================================================")
+    print("TESTE DIFERENCIAL ENTRE MOTORES")
+    print("=================================================================")
+    print(f"Casos: {report['cases']} | motores: {', '.join(ENGINES)} | "
+          f"heurísticas: {', '.join(HEURISTICS)}, HS | peças: {', '.join(MOVE_SETS)}")
+    print(f"Falhas: {len(report['failures'])}")
+    for failure in report["failures"]:
+        print(f"\n[seed {failure['seed']}] {failure['engine']} + {failure['heuristic']}: {failure['error']}")
+        print(format_case(failure["shrunk"]))
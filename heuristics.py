@@ -1,6 +1,10 @@
 # heuristics.py
+import array
 import math
-from collections import deque
+import threading
+from collections import OrderedDict, deque
+
+from board import KNIGHT
 
 def h1_chebyshev(current, goal, min_cost):
     """
@@ -33,12 +37,9 @@ def _get_min_knight_moves(start_pos, end_pos):
     # Conjunto de posições já visitadas, evitando revisitar casas do tabuleiro.
     visited = {start_pos}
 
-    # Define todos os movimentos possíveis do cavalo no xadrez.
+    # Todos os movimentos possíveis do cavalo no xadrez (board.KNIGHT).
     # Cada tupla representa o deslocamento (dx, dy).
-    knight_moves = [
-        (1, 2), (1, -2), (-1, 2), (-1, -2),
-        (2, 1), (2, -1), (-2, 1), (-2, -1)
-    ]
+    knight_moves = KNIGHT.offsets
 
     # Enquanto ainda existirem posições a explorar na fila...
     while queue:
@@ -78,6 +79,191 @@ def h2_knight_distance(current_pos, end_pos, min_cost):
     H2 (Cavalo): Heurística Forte e Admissível.
     Calcula o número mínimo de movimentos de cavalo em um tabuleiro
     vazio e multiplica pelo menor custo de terreno para ser admissível.
+    Assume o tabuleiro 8x8 do jogo; para outros tamanhos use a H3.
     """
     knight_steps = _get_min_knight_moves(current_pos, end_pos)
     return knight_steps * min_cost
+
+
+# --- H3: distância de cavalo em tabuleiro sem bordas (fórmula fechada) ---
+
+def knight_distance_unbounded(start_pos, end_pos):
+    """
+    Número mínimo de saltos de cavalo entre duas casas num tabuleiro INFINITO,
+    em O(1). Como um tabuleiro com bordas só pode aumentar essa distância, o
+    valor é um limite inferior válido para tabuleiros de qualquer tamanho.
+    """
+    dx = abs(start_pos[0] - end_pos[0])
+    dy = abs(start_pos[1] - end_pos[1])
+    if dx < dy:
+        dx, dy = dy, dx
+    # Casos especiais perto da origem, onde a fórmula geral subestima.
+    if dx == 1 and dy == 0:
+        return 3
+    if dx == 2 and dy == 2:
+        return 4
+    delta = dx - dy
+    if dy > delta:
+        return delta - 2 * ((delta - dy) // 3)
+    return delta - 2 * ((delta - dy) // 4)
+
+
+def h3_knight_unbounded(current_pos, end_pos, min_cost):
+    """
+    H3 (Cavalo, fórmula): como a H2, mas sem BFS e sem assumir tabuleiro 8x8.
+    Admissível em tabuleiros de qualquer tamanho (Board(size=...)).
+    """
+    return knight_distance_unbounded(current_pos, end_pos) * min_cost
+
+
+# --- HS: limite de saltos derivado do conjunto de movimentos ---
+
+class StepHeuristic:
+    """
+    Heurística para qualquer peça saltadora (board.MoveSet): o limite inferior
+    de saltos de moves.min_steps() vezes o menor custo de terreno. Admissível
+    em qualquer tabuleiro, porque todo salto custa pelo menos min_cost.
+    Instâncias com os mesmos saltos são iguais (servem de chave de cache).
+    """
+    def __init__(self, moves):
+        self.moves = moves
+        self.__name__ = f"hs_{moves.name}"
+
+    def __call__(self, current_pos, end_pos, min_cost):
+        return self.moves.min_steps(current_pos[0] - end_pos[0], current_pos[1] - end_pos[1]) * min_cost
+
+    def goal_table(self, goal, size, min_cost):
+        gx, gy = goal
+        min_steps = self.moves.min_steps
+        return [min_steps(x - gx, y - gy) * min_cost for y in range(size) for x in range(size)]
+
+    def __eq__(self, other):
+        return isinstance(other, StepHeuristic) and self.moves == other.moves
+
+    def __hash__(self):
+        return hash(self.moves)
+
+    def __repr__(self):
+        return f"StepHeuristic({self.moves!r})"
+
+
+def step_heuristic(moves):
+    """
+    Heurística de saltos para o conjunto de movimentos de um tabuleiro
+    (board.moves). Para o cavalo devolve a H3, que é exata num tabuleiro vazio.
+    """
+    if moves == KNIGHT:
+        return h3_knight_unbounded
+    return StepHeuristic(moves)
+
+
+# --- Avaliação em lote: tabela de H para o tabuleiro inteiro ---
+#
+# Uma heurística pode ter o atributo 'goal_table(goal, size, min_cost)', que
+# devolve uma lista plana (linha a linha, índice y * size + x) com o valor de
+# H de TODAS as casas para aquele objetivo, exatamente igual ao da chamada
+# escalar. As buscas consultam essa tabela (via heuristic_table) em vez de
+# chamar a função uma vez por vizinho; heurísticas sem o atributo continuam
+# sendo chamadas normalmente.
+#
+# Montar a tabela custa mais ou menos uma chamada escalar por casa, então ela
+# só é montada quando a busca já fez table_threshold(board) chamadas escalares
+# (consultas curtas em tabuleiros grandes nunca pagam por ela). Tabelas já
+# montadas para o mesmo objetivo são usadas desde o início.
+
+# Acima disso a tabela custa mais memória e tempo do que economiza.
+MAX_TABLE_CELLS = 1 << 20
+
+# Quantas tabelas ficam em cache (cada uma tem 8 bytes por casa).
+TABLE_CACHE_SIZE = 4
+
+_goal_tables = OrderedDict()   # (heurística, objetivo, size, min_cost) -> array('d')
+_goal_tables_lock = threading.Lock()
+
+
+def _h1_goal_table(goal, size, min_cost):
+    gx, gy = goal
+    step = min_cost * 0.1
+    table = []
+    for y in range(size):
+        dy = abs(y - gy)
+        table.extend([min(abs(x - gx), dy) * step for x in range(size)])
+    return table
+
+
+def _h2_goal_table(goal, size, min_cost):
+    # Uma única BFS a partir do objetivo dá a distância de todas as casas
+    # (os saltos do cavalo são simétricos). Como a H2, limitada ao 8x8.
+    limit = min(8, size)
+    steps = [math.inf] * (size * size)
+    steps[goal[1] * size + goal[0]] = 0
+    if 0 <= goal[0] < 8 and 0 <= goal[1] < 8:
+        queue = deque([goal])
+        while queue:
+            x, y = queue.popleft()
+            dist = steps[y * size + x] + 1
+            for dx, dy in KNIGHT.offsets:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < limit and 0 <= ny < limit and steps[ny * size + nx] == math.inf:
+                    steps[ny * size + nx] = dist
+                    queue.append((nx, ny))
+        # A BFS escalar parte da casa atual mesmo fora do 8x8 e só então entra
+        # nele: essas casas valem 1 + a melhor vizinha de dentro.
+        for y in range(size):
+            for x in range(8 if y < 8 else 0, size):
+                steps[y * size + x] = 1 + min(
+                    (steps[(y + dy) * size + x + dx] for dx, dy in KNIGHT.offsets
+                     if 0 <= x + dx < limit and 0 <= y + dy < limit),
+                    default=math.inf)
+    return [s * min_cost for s in steps]
+
+
+def _h3_goal_table(goal, size, min_cost):
+    return [
+        knight_distance_unbounded((x, y), goal) * min_cost
+        for y in range(size) for x in range(size)
+    ]
+
+
+h1_chebyshev.goal_table = _h1_goal_table
+h2_knight_distance.goal_table = _h2_goal_table
+h3_knight_unbounded.goal_table = _h3_goal_table
+
+
+def clear_heuristic_tables():
+    """ Descarta todas as tabelas de H em cache (ex.: antes de medir memória). """
+    with _goal_tables_lock:
+        _goal_tables.clear()
+
+
+def table_threshold(board):
+    """ Chamadas escalares que uma busca faz antes de montar a tabela de H. """
+    return board.size * board.size // 2
+
+
+def heuristic_table(heuristic_func, board, goal, build=True):
+    """
+    Tabela de H (array('d') plano, índice y * board.size + x) para 'goal', ou
+    None se a heurística não tem avaliação em lote ou o tabuleiro é grande
+    demais. Com build=False só devolve uma tabela que já esteja em cache.
+    As tabelas só dependem do tamanho e de min_cost, não do terreno, e as
+    TABLE_CACHE_SIZE mais recentes ficam em cache. Não modifique a tabela.
+    """
+    if getattr(heuristic_func, 'goal_table', None) is None:
+        return None
+    if board.size * board.size > MAX_TABLE_CELLS:
+        return None
+    key = (heuristic_func, tuple(goal), board.size, board.min_cost)
+    with _goal_tables_lock:
+        table = _goal_tables.get(key)
+        if table is not None:
+            _goal_tables.move_to_end(key)
+            return table
+    if not build:
+        return None
+    table = array.array('d', heuristic_func.goal_table(key[1], board.size, board.min_cost))
+    with _goal_tables_lock:
+        _goal_tables[key] = table
+        while len(_goal_tables) > TABLE_CACHE_SIZE:
+            _goal_tables.popitem(last=False)
+    return table
@@ -0,0 +1,541 @@
+# hierarchical.py
+import argparse
+import heapq
+import math
+import random
+import time
+
+from a_star import run_search
+from board import Board
+from compact_search import a_star_search_compact
+from heuristics import h3_knight_unbounded, step_heuristic
+
+# Numa sequência contínua de travessias ao longo de um lado do cluster, uma
+# transição (a travessia mais barata) por trecho de até TRANSITION_SPACING casas.
+TRANSITION_SPACING = 8
+
+
+class HierarchicalPlanner:
+    """
+    Planejador hierárquico no estilo HPA* para tabuleiros grandes.
+
+    O tabuleiro é dividido em clusters de cluster_size x cluster_size casas.
+    Em vez de usar como nó abstrato toda casa com salto para fora do cluster
+    (quase metade do tabuleiro com clusters de 16), cada par de clusters
+    vizinhos ganha poucas TRANSIÇÕES: os saltos que atravessam a fronteira
+    são agrupados por componente conexa dos dois lados e em sequências
+    contínuas ao longo do lado, e cada sequência vira um salto representante
+    a cada TRANSITION_SPACING casas. Para cada cluster guardamos, sob
+    demanda, uma tabela com o custo mínimo entre suas transições usando só
+    casas do próprio cluster.
+
+    A busca acontece primeiro no grafo abstrato (transições + saltos entre
+    clusters) e depois um A* sobre as casas reais, restrito aos clusters do
+    caminho abstrato, refina o resultado (e pode atravessar as fronteiras
+    fora das transições escolhidas).
+
+    O resultado é QUASE ótimo, como no HPA*: o caminho é sempre válido e
+    sempre achado quando existe (cada componente de cada lado tem sua
+    transição), mas pode custar um pouco mais que o ótimo, porque fica no
+    corredor escolhido no grafo abstrato. Em tabuleiros sorteados de 256 e
+    512 casas (clusters de 16), fica em média uns 4% acima do ótimo. Para o
+    custo exato, use o A* comum.
+
+    Assume peças simétricas (todo salto tem o salto inverso), como as de
+    board.MOVE_SETS.
+
+    A tabela de um cluster só depende das casas dele e das transições; ao
+    mudar o terreno, chame update_cells() e só os clusters afetados são
+    recalculados.
+    """
+
+    def __init__(self, board, cluster_size=16):
+        self.board = board
+        self.cluster_size = cluster_size
+        # (cx, cy) -> grafo local do cluster (ver _graph)
+        self._graphs = {}
+        # (cx, cy) -> [(casa, casa em outro cluster)]: saltos que saem do cluster
+        self._exits = {}
+        # (cluster, cluster) em ordem -> [(casa no 1º, casa no 2º)]: travessias escolhidas
+        self._pairs = {}
+        # (cx, cy) -> {transição: [casas do outro lado]}
+        self._nodes = {}
+        # (cx, cy) -> {transição: {outra_transição: custo}}
+        self._tables = {}
+        self.tables_built = 0
+
+    # --- Geometria dos clusters ---
+
+    def cluster_of(self, pos):
+        return (pos[0] // self.cluster_size, pos[1] // self.cluster_size)
+
+    def _bounds(self, cluster):
+        """ Limites [x0, x1) x [y0, y1) do cluster, cortados na borda do tabuleiro. """
+        x0 = cluster[0] * self.cluster_size
+        y0 = cluster[1] * self.cluster_size
+        x1 = min(x0 + self.cluster_size, self.board.size)
+        y1 = min(y0 + self.cluster_size, self.board.size)
+        return x0, y0, x1, y1
+
+    def _exits_of(self, cluster):
+        """
+        Saltos válidos de uma casa do cluster para uma casa de outro cluster,
+        separados pelo cluster de chegada: {cluster: [(casa, casa lá)]}.
+        """
+        exits = self._exits.get(cluster)
+        if exits is None:
+            x0, y0, x1, y1 = self._bounds(cluster)
+            reach = self.board.moves.reach
+            offsets = self.board.moves.offsets
+            grid, board_size = self.board.grid, self.board.size
+            size = self.cluster_size
+            exits = {}
+            for x, y in self._graph(cluster)[0]:
+                if x0 + reach <= x < x1 - reach and y0 + reach <= y < y1 - reach:
+                    continue  # nenhum salto sai do cluster
+                for dx, dy in offsets:
+                    nx, ny = x + dx, y + dy
+                    if x0 <= nx < x1 and y0 <= ny < y1:
+                        continue
+                    if 0 <= nx < board_size and 0 <= ny < board_size and grid[ny][nx] != math.inf:
+                        exits.setdefault((nx // size, ny // size), []).append(((x, y), (nx, ny)))
+            self._exits[cluster] = exits
+        return exits
+
+    # --- Transições ---
+
+    def _pair(self, a, b):
+        """
+        Travessias escolhidas entre os clusters vizinhos a e b (mesma lista
+        vista dos dois lados): [(casa no menor cluster, casa no maior)].
+        Em cada trecho fica a travessia mais barata (custo das duas casas).
+        """
+        if b < a:
+            a, b = b, a
+        chosen = self._pairs.get((a, b))
+        if chosen is None:
+            cost = self.board.get_cost
+            index_a, comp_a = self._graph(a)[1], self._graph(a)[4]
+            index_b, comp_b = self._graph(b)[1], self._graph(b)[4]
+            # Posição ao longo do lado comum; clusters na diagonal têm um "lado" só.
+            axis = 1 if a[1] == b[1] else 0 if a[0] == b[0] else None
+
+            groups = {}
+            for p, q in self._exits_of(a).get(b, ()):
+                t = p[axis] if axis is not None else 0
+                key = (comp_a[index_a[p]], comp_b[index_b[q]])
+                groups.setdefault(key, {}).setdefault(t, []).append((p, q))
+            if axis is None:
+                # Na diagonal, só quando as componentes não se ligam por um
+                # dos dois clusters do canto (o refinamento ainda pode usar o
+                # salto direto, se ele ficar no corredor).
+                groups = {key: by_t for key, by_t in groups.items() if not self._linked(a, b, *key)}
+
+            chosen = []
+            for by_t in groups.values():
+                ts = sorted(by_t)
+                run_start = 0
+                for k in range(1, len(ts) + 1):
+                    if k < len(ts) and ts[k] == ts[k - 1] + 1:
+                        continue
+                    run = ts[run_start:k]
+                    count = -(-len(run) // TRANSITION_SPACING)
+                    for i in range(count):
+                        # Um representante por trecho igual da sequência: a
+                        # travessia mais barata, desempatando pelo meio do trecho.
+                        segment = run[i * len(run) // count:(i + 1) * len(run) // count]
+                        middle = segment[len(segment) // 2]
+                        chosen.append(min(
+                            (cost(p) + cost(q), abs(t - middle), p, q)
+                            for t in segment for p, q in by_t[t]
+                        )[2:])
+                    run_start = k
+            self._pairs[(a, b)] = chosen
+        return chosen
+
+    def _linked(self, a, b, comp_a, comp_b):
+        """
+        Se a componente comp_a do cluster a chega à comp_b do cluster b
+        (diagonais) por travessias escolhidas através de um cluster do canto.
+        """
+        index_a, labels_a = self._graph(a)[1], self._graph(a)[4]
+        index_b, labels_b = self._graph(b)[1], self._graph(b)[4]
+        for corner in ((a[0], b[1]), (b[0], a[1])):
+            index_c, labels_c = self._graph(corner)[1], self._graph(corner)[4]
+            reached = set()
+            for p, q in self._pair(a, corner):
+                own, far = (p, q) if self.cluster_of(p) == a else (q, p)
+                if labels_a[index_a[own]] == comp_a:
+                    reached.add(labels_c[index_c[far]])
+            for p, q in self._pair(corner, b):
+                own, far = (p, q) if self.cluster_of(p) == b else (q, p)
+                if labels_b[index_b[own]] == comp_b and labels_c[index_c[far]] in reached:
+                    return True
+        return False
+
+    def _neighbors(self, cluster):
+        """ Clusters alcançados por algum salto a partir deste. """
+        reach = self.board.moves.reach
+        n = math.ceil(self.board.size / self.cluster_size)
+        span = -(-reach // self.cluster_size)
+        cx, cy = cluster
+        return [
+            (nx, ny)
+            for ny in range(max(0, cy - span), min(n, cy + span + 1))
+            for nx in range(max(0, cx - span), min(n, cx + span + 1))
+            if (nx, ny) != cluster
+        ]
+
+    def _nodes_of(self, cluster):
+        """ Transições do cluster -> casas do outro lado das suas travessias. """
+        nodes = self._nodes.get(cluster)
+        if nodes is None:
+            nodes = {}
+            for other in self._neighbors(cluster):
+                for p, q in self._pair(cluster, other):
+                    own, far = (p, q) if self.cluster_of(p) == cluster else (q, p)
+                    nodes.setdefault(own, []).append(far)
+            self._nodes[cluster] = nodes
+        return nodes
+
+    # --- Buscas restritas a um cluster ---
+
+    def _graph(self, cluster):
+        """
+        Grafo local do cluster: lista de casas transitáveis, índice
+        posição -> i, custo de entrar em cada casa, vizinhos (por índice)
+        dentro do cluster e o número da componente conexa de cada casa.
+        """
+        graph = self._graphs.get(cluster)
+        if graph is None:
+            x0, y0, x1, y1 = self._bounds(cluster)
+            width, height = x1 - x0, y1 - y0
+            grid = self.board.grid
+            # local[ly * width + lx] = índice da casa, ou -1 (barreira).
+            local = [-1] * (width * height)
+            cells = []
+            costs = []
+            for y in range(y0, y1):
+                row = grid[y]
+                for x in range(x0, x1):
+                    if row[x] != math.inf:
+                        local[(y - y0) * width + x - x0] = len(cells)
+                        cells.append((x, y))
+                        costs.append(row[x])
+            index = {pos: i for i, pos in enumerate(cells)}
+            adj = []
+            for x, y in cells:
+                lx, ly = x - x0, y - y0
+                adj.append([
+                    local[(ly + dy) * width + lx + dx]
+                    for dx, dy in self.board.moves.offsets
+                    if 0 <= lx + dx < width and 0 <= ly + dy < height and local[(ly + dy) * width + lx + dx] >= 0
+                ])
+            comp = [-1] * len(cells)
+            for root in range(len(cells)):
+                if comp[root] < 0:
+                    comp[root] = root
+                    stack = [root]
+                    while stack:
+                        for j in adj[stack.pop()]:
+                            if comp[j] < 0:
+                                comp[j] = root
+                                stack.append(j)
+            graph = (cells, index, costs, adj, comp)
+            self._graphs[cluster] = graph
+        return graph
+
+    def _cluster_dijkstra(self, origin, cluster, reverse=False, targets=()):
+        """
+        Dijkstra usando só casas do cluster. Com reverse=True calcula o custo
+        de cada casa ATÉ 'origin' (para ligar as transições ao objetivo).
+        Com 'targets', para assim que todas elas saem do heap.
+        Devolve dist como lista indexada pelo grafo local.
+        """
+        _, index, costs, adj, _ = self._graph(cluster)
+        heappush, heappop = heapq.heappush, heapq.heappop
+        pending = {index[t] for t in targets}
+        dist = [math.inf] * len(costs)
+        src = index[origin]
+        dist[src] = 0
+        heap = [(0, src)]
+
+        while heap:
+            d, i = heappop(heap)
+            if d > dist[i]:
+                continue  # entrada velha do heap
+            if pending:
+                pending.discard(i)
+                if not pending:
+                    break
+
+            # Na busca reversa o custo da aresta j -> i é o custo de entrar em i.
+            back = costs[i]
+            for j in adj[i]:
+                nd = d + (back if reverse else costs[j])
+                if nd < dist[j]:
+                    dist[j] = nd
+                    heappush(heap, (nd, j))
+
+        return dist
+
+    def _dist_map(self, origin, cluster, reverse=False):
+        """ Como _cluster_dijkstra, mas devolve {posição: custo} só das casas alcançadas. """
+        cells = self._graph(cluster)[0]
+        dist = self._cluster_dijkstra(origin, cluster, reverse=reverse)
+        return {cells[i]: d for i, d in enumerate(dist) if d != math.inf}
+
+    def _table(self, cluster):
+        """
+        Tabela de custos entre as transições do cluster (calculada e guardada
+        sob demanda). Com saltos simétricos, o caminho de volta é o mesmo ao
+        contrário: custo(b -> a) = custo(a -> b) - custo(b) + custo(a). Então
+        cada Dijkstra só precisa chegar às transições seguintes da lista.
+        """
+        table = self._tables.get(cluster)
+        if table is None:
+            _, index, costs, _, comp = self._graph(cluster)
+            nodes = sorted(self._nodes_of(cluster))
+            table = {node: {} for node in nodes}
+            for k, node in enumerate(nodes):
+                i = index[node]
+                later = [other for other in nodes[k + 1:] if comp[index[other]] == comp[i]]
+                if not later:
+                    continue
+                dist = self._cluster_dijkstra(node, cluster, targets=later)
+                for other in later:
+                    j = index[other]
+                    table[node][other] = dist[j]
+                    table[other][node] = dist[j] - costs[j] + costs[i]
+            self._tables[cluster] = table
+            self.tables_built += 1
+        return table
+
+    def precompute(self):
+        """ Monta as tabelas de todos os clusters de uma vez (opcional). """
+        n = math.ceil(self.board.size / self.cluster_size)
+        for cy in range(n):
+            for cx in range(n):
+                self._table((cx, cy))
+
+    def update_cells(self, positions):
+        """
+        Avisa que o terreno dessas casas mudou. A tabela do cluster de cada
+        casa é refeita (se já tinha sido calculada); a de um vizinho só é
+        refeita se as transições dele mudaram (uma casa virou ou deixou de
+        ser barreira perto da fronteira).
+        """
+        touched = {self.cluster_of(p) for p in positions}
+        around = {other for cluster in touched for other in self._neighbors(cluster)} - touched
+        old_nodes = {cluster: self._nodes.pop(cluster, None) for cluster in around}
+
+        for cluster in touched:
+            self._graphs.pop(cluster, None)
+            self._nodes.pop(cluster, None)
+        for cluster in touched | around:
+            self._exits.pop(cluster, None)
+        # Pares diagonais entre dois vizinhos dependem do cluster do canto.
+        for key in [key for key in self._pairs
+                    if key[0] in touched or key[1] in touched or (key[0] in around and key[1] in around)]:
+            del self._pairs[key]
+
+        for cluster in touched:
+            if self._tables.pop(cluster, None) is not None:
+                self._table(cluster)
+        for cluster, nodes in old_nodes.items():
+            if cluster in self._tables and self._nodes_of(cluster) != nodes:
+                del self._tables[cluster]
+                self._table(cluster)
+
+    # --- Busca ---
+
+    def find_path(self, start_pos, end_pos, heuristic_func=None):
+        """
+        Busca hierárquica de start_pos até end_pos. Devolve a mesma tupla final
+        dos geradores de busca: (path, nodes_expanded, g_costs, initial_h).
+        nodes_expanded soma os nós do grafo abstrato e as casas do
+        refinamento; g_costs é o do refinamento (casas do corredor), então
+        g_costs[end_pos] é o custo do caminho devolvido.
+        Sem heurística, usa step_heuristic(board.moves) (H3 para o cavalo).
+        """
+        board = self.board
+        if heuristic_func is None:
+            heuristic_func = step_heuristic(board.moves)
+        min_cost = board.min_cost
+        initial_h = heuristic_func(start_pos, end_pos, min_cost)
+
+        if not board.is_valid(start_pos) or not board.is_valid(end_pos):
+            return None, 0, {}, initial_h
+
+        start_cluster = self.cluster_of(start_pos)
+        goal_cluster = self.cluster_of(end_pos)
+
+        # Liga o início às transições do seu cluster, e as transições do
+        # cluster do objetivo ao objetivo (arestas temporárias, fora do cache).
+        start_dist = self._dist_map(start_pos, start_cluster)
+        start_edges = [(node, start_dist[node]) for node in self._nodes_of(start_cluster)
+                       if node != start_pos and node in start_dist]
+        goal_dist = self._dist_map(end_pos, goal_cluster, reverse=True)
+
+        g_costs = {start_pos: 0}
+        parents = {start_pos: None}
+        open_list = [(initial_h, start_pos)]
+        closed_set = set()
+        nodes_expanded = 0
+
+        while open_list:
+            _, pos = heapq.heappop(open_list)
+            if pos in closed_set:
+                continue
+            closed_set.add(pos)
+            nodes_expanded += 1
+
+            if pos == end_pos:
+                path, refined, g_costs = self._refine(self._abstract_path(parents, end_pos), heuristic_func)
+                return path, nodes_expanded + refined, g_costs, initial_h
+
+            g = g_costs[pos]
+            cluster = self.cluster_of(pos)
+            nodes = self._nodes_of(cluster)
+
+            # Arestas dentro do cluster.
+            if pos == start_pos:
+                edges = list(start_edges)
+            else:
+                edges = list(self._table(cluster)[pos].items())
+            if cluster == goal_cluster and pos in goal_dist:
+                edges.append((end_pos, goal_dist[pos]))
+
+            # Travessias para outros clusters.
+            for nxt in nodes.get(pos, ()):
+                edges.append((nxt, board.get_cost(nxt)))
+
+            for nxt, cost in edges:
+                new_g = g + cost
+                if nxt not in g_costs or new_g < g_costs[nxt]:
+                    g_costs[nxt] = new_g
+                    parents[nxt] = pos
+                    heapq.heappush(open_list, (new_g + heuristic_func(nxt, end_pos, min_cost), nxt))
+
+        return None, nodes_expanded, g_costs, initial_h
+
+    def _abstract_path(self, parents, end_pos):
+        path = []
+        current = end_pos
+        while current is not None:
+            path.append(current)
+            current = parents[current]
+        return path[::-1]
+
+    def _refine(self, abstract_path, heuristic_func):
+        """
+        Refina o caminho abstrato com um A* sobre as casas reais, restrito
+        aos clusters por onde ele passa mais os vizinhos dos clusters do
+        início e do objetivo (o "corredor"; as consultas curtas são as que
+        mais perdem com poucas transições). O caminho abstrato cabe no
+        corredor, então o refinado nunca custa mais que ele, e pode
+        atravessar as fronteiras fora das transições escolhidas.
+        Devolve (path, nodes_expanded, g_costs).
+        """
+        board = self.board
+        size = self.cluster_size
+        offsets = board.moves.offsets
+        min_cost = board.min_cost
+        start_pos, end_pos = abstract_path[0], abstract_path[-1]
+        corridor = {self.cluster_of(pos) for pos in abstract_path}
+        corridor.update(self._neighbors(self.cluster_of(start_pos)), self._neighbors(self.cluster_of(end_pos)))
+
+        g_costs = {start_pos: 0}
+        parents = {start_pos: None}
+        open_list = [(0, start_pos)]
+        closed_set = set()
+        while open_list:
+            _, pos = heapq.heappop(open_list)
+            if pos in closed_set:
+                continue
+            closed_set.add(pos)
+            if pos == end_pos:
+                break
+            g = g_costs[pos]
+            for dx, dy in offsets:
+                nxt = (pos[0] + dx, pos[1] + dy)
+                if nxt in closed_set or not board.is_valid(nxt):
+                    continue
+                if (nxt[0] // size, nxt[1] // size) not in corridor:
+                    continue
+                new_g = g + board.get_cost(nxt)
+                if new_g < g_costs.get(nxt, math.inf):
+                    g_costs[nxt] = new_g
+                    parents[nxt] = pos
+                    heapq.heappush(open_list, (new_g + heuristic_func(nxt, end_pos, min_cost), nxt))
+
+        return self._abstract_path(parents, end_pos), len(closed_set), g_costs
+
+
+# --- Comparação com o A* comum ---
+
+def benchmark_report(size=256, cluster_size=16, seed=0, queries=4, heuristic_func=h3_knight_unbounded):
+    """
+    Mede o HPA* contra o A* comum (a_star_search_compact) em um tabuleiro
+    sorteado (semente fixa): a primeira consulta de canto a canto e mais
+    algumas aleatórias. A 1ª rodada do planejador monta as tabelas dos
+    clusters que a busca visita; a 2ª já as encontra prontas. Também mede o
+    custo relativo ao ótimo.
+    """
+    random.seed(seed)
+    board = Board(size)
+    rng = random.Random(seed)
+    valid = [(x, y) for y in range(size) for x in range(size) if board.is_valid((x, y))]
+    diagonal = [(i, i) for i in range(size) if board.is_valid((i, i))]
+    pairs = [(diagonal[0], diagonal[-1])] + [tuple(rng.sample(valid, 2)) for _ in range(queries - 1)]
+
+    optimum = []
+    t0 = time.perf_counter()
+    for start, goal in pairs:
+        path, _, g_costs, _ = run_search(board, start, goal, heuristic_func, a_star_search_compact)
+        optimum.append(g_costs[goal] if path else None)
+    flat_time = time.perf_counter() - t0
+
+    planner = HierarchicalPlanner(board, cluster_size)
+    rounds = []
+    for _ in range(2):
+        ratios = []
+        t0 = time.perf_counter()
+        for (start, goal), expected in zip(pairs, optimum):
+            path, _, g_costs, _ = planner.find_path(start, goal, heuristic_func)
+            if (path is None) != (expected is None):
+                raise AssertionError(f"HPA* e A* discordam sobre existir caminho de {start} a {goal}")
+            if path is not None:
+                ratios.append(g_costs[goal] / expected if expected else 1.0)
+        rounds.append({"seconds": time.perf_counter() - t0, "tables": planner.tables_built, "ratios": ratios})
+
+    cold, warm = rounds
+    return {
+        "size": size, "cluster_size": cluster_size, "queries": queries,
+        "flat_seconds": flat_time,
+        "cold_seconds": cold["seconds"], "warm_seconds": warm["seconds"],
+        "tables": cold["tables"],
+        "speedup": flat_time / warm["seconds"],
+        "mean_ratio": sum(warm["ratios"]) / max(1, len(warm["ratios"])),
+        "max_ratio": max(warm["ratios"], default=1.0),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HPA* contra o A* comum em tabuleiros grandes")
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--cluster", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = benchmark_report(args.size, args.cluster, args.seed, args.queries)
+    print("=================================================================")
+    print(f"HPA* — tabuleiro {report['size']}x{report['size']}, clusters de {report['cluster_size']}, "
+          f"{report['queries']} consultas")
+    print("=================================================================")
+    print(f"A* comum (compact):           {report['flat_seconds']:.2f} s")
+    print(f"HPA* 1ª rodada (monta {report['tables']} tabelas): {report['cold_seconds']:.2f} s")
+    print(f"HPA* 2ª rodada (tabelas prontas): {report['warm_seconds']:.2f} s | "
+          f"aceleração {report['speedup']:.1f}x")
+    print(f"Custo / ótimo: média {report['mean_ratio']:.3f} | pior {report['max_ratio']:.3f}")
@@ -3,6 +3,7 @@
 from board import Board
 from visualization import Visualizer
 from a_star import a_star_search
+from path_cache import PathCache
 # --- MUDANÇA: Importa apenas as 2 heurísticas ---
 from heuristics import h1_chebyshev, h2_knight_distance
 
@@ -23,16 +24,21 @@ def main():
         "H2 (Cavalo)": h2_knight_distance,
     }
     
-    # 3. Cria o visualizador
+    # 3. Cache de resultados: reiniciar com [ESPAÇO]/[R] no mesmo tabuleiro
+    # não refaz a busca ([N] muda a versão do tabuleiro e limpa o cache).
+    path_cache = PathCache(board)
+
+    # 4. Cria o visualizador
     visualizer = Visualizer(board)
     
-    # 4. Inicia o loop principal
+    # 5. Inicia o loop principal
     visualizer.run(
         start_pos=START_POS,
         end_pos=END_POS,
         heuristic_options=heuristic_options,
-        search_function=a_star_search
+        search_function=path_cache.wrap(a_star_search)
     )
+    print(f"Cache de caminhos: {path_cache.stats()}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,188 @@
+# memory_profile.py
+"""
+Perfil de memória das buscas (tracemalloc) e relatório de escala por tamanho
+de tabuleiro.
+
+Cada consulta é dividida em fases, e em cada fase tiramos um snapshot do
+tracemalloc antes e depois:
+    tabuleiro   Board(size) (grid de custos)
+    busca       o gerador inteiro, com a tabela de H e os estados emitidos
+    resultados  a cópia que o visualizador guarda em self.results
+                (g_costs.copy(), closed_set.copy(), open_set.copy())
+Para cada fase: memória que ficou ('retained'), pico acima do início da fase
+('peak') e as linhas que mais alocaram (comparação dos snapshots).
+
+    python memory_profile.py --sizes 64 128 256 512
+"""
+import argparse
+import gc
+import math
+import random
+import time
+import tracemalloc
+
+from board import Board, KNIGHT
+from a_star import a_star_search
+from compact_search import a_star_search_compact
+from heuristics import clear_heuristic_tables, step_heuristic
+
+ENGINES = {
+    "a_star": a_star_search,
+    "compact": a_star_search_compact,
+}
+
+# Frames do próprio tracemalloc não entram nas comparações.
+_IGNORE = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+
+def _corner_queries(board):
+    """ Primeira casa livre de cima à esquerda e última de baixo à direita. """
+    cells = [(x, y) for y in range(board.size) for x in range(board.size)]
+    start = next(p for p in cells if board.is_valid(p))
+    goal = next(p for p in reversed(cells) if board.is_valid(p))
+    return start, goal
+
+
+def _drain(gen):
+    """ Como run_search, mas devolve também o último estado emitido. """
+    state = {}
+    while True:
+        try:
+            state = next(gen)
+        except StopIteration as e:
+            return e.value, state
+
+
+class _Profiler:
+    def __init__(self, top):
+        self.top = top
+        self.phases = []
+
+    def run(self, name, fn):
+        gc.collect()
+        before = tracemalloc.take_snapshot().filter_traces(_IGNORE)
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        value = fn()
+        seconds = time.perf_counter() - t0
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(_IGNORE)
+        top = [
+            (str(stat.traceback[0]), stat.size_diff)
+            for stat in after.compare_to(before, "lineno")[:self.top]
+        ]
+        self.phases.append({
+            "phase": name,
+            "retained": current - base,
+            "peak": peak - base,
+            "seconds": seconds,
+            "top": top,
+        })
+        return value
+
+
+def profile_search(size=128, engine="a_star", heuristic_func=None, seed=0, moves=KNIGHT, top=5):
+    """
+    Roda uma consulta de canto a canto num Board(size) sorteado (semente fixa)
+    com o motor 'engine' (nome em ENGINES) e devolve o perfil de memória por
+    fase. O tracemalloc é ligado só durante a medição (se já não estava).
+    """
+    search_function = ENGINES[engine]
+    heuristic_func = heuristic_func or step_heuristic(moves)
+    # Sem tabelas de H de consultas anteriores: a busca paga pela sua.
+    clear_heuristic_tables()
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        profiler = _Profiler(top)
+        random.seed(seed)
+        board = profiler.run("tabuleiro", lambda: Board(size, moves=moves))
+        start, goal = _corner_queries(board)
+        result, state = profiler.run(
+            "busca", lambda: _drain(search_function(board, start, goal, heuristic_func)))
+        path, nodes, g_costs, _ = result
+        results = profiler.run("resultados", lambda: {
+            "path": path,
+            "g_costs": g_costs.copy(),
+            "closed_set": state.get("closed", set()).copy(),
+            "open_set": state.get("open", set()).copy(),
+        })
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    return {
+        "size": size,
+        "cells": size * size,
+        "engine": engine,
+        "nodes": nodes,
+        "cost": g_costs[goal] if path else math.inf,
+        "phases": profiler.phases,
+        "visited": len(results["g_costs"]),
+    }
+
+
+def scaling_report(sizes=(32, 64, 128, 256), engines=tuple(ENGINES), seed=0, moves=KNIGHT):
+    """
+    Uma linha por (tamanho, motor): pico de memória da busca, em bytes e por
+    casa do tabuleiro, memória retida pelos resultados e tempo. Confere que
+    todos os motores chegam ao mesmo custo.
+    """
+    rows = []
+    for size in sizes:
+        costs = {}
+        for engine in engines:
+            profile = profile_search(size, engine, seed=seed, moves=moves, top=0)
+            phases = {p["phase"]: p for p in profile["phases"]}
+            search, results = phases["busca"], phases["resultados"]
+            costs[engine] = profile["cost"]
+            rows.append({
+                "size": size,
+                "engine": engine,
+                "nodes": profile["nodes"],
+                "search_peak": search["peak"],
+                "bytes_per_cell": search["peak"] / profile["cells"],
+                "results": results["retained"],
+                "seconds": search["seconds"],
+            })
+        values = list(costs.values())
+        if not all(math.isclose(c, values[0]) or c == values[0] for c in values):
+            raise AssertionError(f"{size}x{size}: custos diferentes entre motores {costs}")
+    return rows
+
+
+def _mib(n):
+    return n / (1024 * 1024)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perfil de memória das buscas (tracemalloc)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 64, 128, 256])
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--top", type=int, default=5, help="linhas por fase no perfil detalhado")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    size = max(args.sizes)
+    for engine in args.engines:
+        profile = profile_search(size, engine, seed=args.seed, top=args.top)
+        print("=================================================================")
+        print(f"PERFIL DE MEMÓRIA — {engine}, tabuleiro {size}x{size}, "
+              f"{profile['nodes']} nós, {profile['visited']} casas com g")
+        print("=================================================================")
+        for phase in profile["phases"]:
+            print(f"{phase['phase']:<11} retido {_mib(phase['retained']):8.2f} MiB | "
+                  f"pico {_mib(phase['peak']):8.2f} MiB | {phase['seconds']:.2f} s")
+            for where, diff in phase["top"]:
+                print(f"    {diff / 1024:10.1f} KiB  {where}")
+
+    print("=================================================================")
+    print("ESCALA POR TAMANHO (pico da fase de busca)")
+    print("=================================================================")
+    for row in scaling_report(args.sizes, args.engines, args.seed):
+        print(f"{row['size']:>5}x{row['size']:<5} {row['engine']:<8} nós {row['nodes']:>8} | "
+              f"pico {_mib(row['search_peak']):8.2f} MiB ({row['bytes_per_cell']:6.1f} B/casa) | "
+              f"resultados {_mib(row['results']):7.2f} MiB | {row['seconds']:.2f} s")
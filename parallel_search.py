@@ -0,0 +1,317 @@
+# parallel_search.py
+"""
+Busca paralela no estilo HDA* (Hash Distributed A*).
+
+Cada casa tem um dono (um processo), escolhido por hash da posição. Cada
+processo mantém a própria lista aberta e os próprios g/pais; ao gerar um
+vizinho que pertence a outro processo, manda (casa, g, pai) para a fila de
+entrada do dono, em lotes. O custo do terreno fica num único buffer de
+memória compartilhada (somente leitura) que todos os processos mapeiam.
+
+Otimalidade e término:
+- O dono do objetivo guarda em 'incumbent' o menor custo já encontrado até
+  ele; nós com f >= incumbent são descartados em todos os processos.
+- O coordenador (processo pai) só encerra quando todos os processos estão
+  ociosos (fila de entrada vazia e nenhum nó com f < incumbent), nenhum lote
+  está em trânsito (enviados == recebidos) e isso se repete igual em duas
+  leituras seguidas. Nesse ponto, com heurística admissível, incumbent é o
+  custo ótimo.
+
+Relatório de escalabilidade (1..N processos em tabuleiros sorteados):
+    python parallel_search.py --size 128 --workers 1 2 4
+"""
+import argparse
+import array
+import heapq
+import math
+import multiprocessing as mp
+import queue
+import random
+import time
+from multiprocessing import shared_memory
+
+from board import Board
+from board_store import MappedBoard, _MappedGrid
+from a_star import run_search
+from heuristics import h3_knight_unbounded, heuristic_table, table_threshold
+
+# Quantos nós cada processo expande antes de olhar a fila de entrada de novo.
+EXPANSIONS_PER_ROUND = 64
+
+
+def owner_of(pos, workers):
+    """ Processo dono de uma casa (hash fixo, igual em todos os processos). """
+    return ((pos[0] * 73856093) ^ (pos[1] * 19349663)) % workers
+
+
+class SharedBoard(MappedBoard):
+    """
+    Board somente-leitura sobre um buffer de memória compartilhada criado por
+    share_board(). Reaproveita o acesso direto ao buffer do MappedBoard.
+    """
+    def __init__(self, shm_name, size, costs, moves):
+        # Não chama MappedBoard.__init__: não há arquivo, só o segmento compartilhado.
+        self._shm = shared_memory.SharedMemory(name=shm_name)
+        self.size = size
+        self.version = 0
+        self.costs = costs
+        self.moves = moves
+        self.terrain_types = list(costs.keys())
+        self.min_cost = min(c for c in costs.values() if c != math.inf)
+        self.tables = {}
+        self._cells = self._shm.buf[:size * size * 8].cast("d")
+        self.grid = _MappedGrid(self._cells, size)
+
+    def close(self):
+        self.grid = None
+        self._cells.release()
+        self._cells = None
+        self._shm.close()
+
+
+def share_board(board):
+    """ Copia os custos do tabuleiro para um segmento compartilhado novo. """
+    cells = array.array("d", (cost for row in board.grid for cost in row))
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(cells) * cells.itemsize))
+    shm.buf[:len(cells) * cells.itemsize] = cells.tobytes()
+    return shm
+
+
+def _worker(index, workers, shm_name, size, costs, moves, end_pos, heuristic_func,
+            inboxes, results, idle, activity, sent, received, incumbent):
+    board = SharedBoard(shm_name, size, costs, moves)
+    min_cost = board.min_cost
+    offsets = moves.offsets
+    h_table = heuristic_table(heuristic_func, board, end_pos, build=False)
+    scalar_calls = table_threshold(board)
+
+    def h(pos):
+        nonlocal h_table, scalar_calls
+        if h_table is not None:
+            return h_table[pos[1] * size + pos[0]]
+        scalar_calls -= 1
+        if not scalar_calls:
+            h_table = heuristic_table(heuristic_func, board, end_pos)
+        return heuristic_func(pos, end_pos, min_cost)
+
+    inbox = inboxes[index]
+    g_costs = {}
+    parents = {}
+    open_list = []
+    expanded = 0
+    is_idle = False
+
+    def relax(pos, g, parent):
+        if g < g_costs.get(pos, math.inf):
+            f = g + h(pos)
+            if f < incumbent.value:
+                g_costs[pos] = g
+                parents[pos] = parent
+                heapq.heappush(open_list, (f, g, pos))
+
+    while True:
+        # 1. Fila de entrada (espera um pouco só se estiver ocioso).
+        try:
+            msg = inbox.get(timeout=0.002) if is_idle else inbox.get_nowait()
+        except queue.Empty:
+            msg = None
+
+        if msg is not None:
+            if is_idle:
+                is_idle = False
+                idle[index] = 0
+                activity[index] += 1
+            kind = msg[0]
+            if kind == "nodes":
+                for pos, g, parent in msg[1]:
+                    relax(pos, g, parent)
+                received[index] += 1
+            elif kind == "parent":
+                pos = msg[1]
+                results.put(("parent", pos, parents.get(pos), g_costs.get(pos)))
+            elif kind == "stop":
+                results.put(("stats", index, expanded))
+                break
+            continue
+
+        # 2. Expande uma rodada de nós locais.
+        outboxes = [[] for _ in range(workers)]
+        for _ in range(EXPANSIONS_PER_ROUND):
+            if not open_list:
+                break
+            f, g, pos = heapq.heappop(open_list)
+            if f >= incumbent.value:
+                # incumbent só diminui: nada na lista aberta ainda é útil.
+                open_list.clear()
+                break
+            if g > g_costs[pos]:
+                continue  # entrada velha (a casa já recebeu g menor)
+            expanded += 1
+
+            if pos == end_pos:
+                incumbent.value = g
+                continue
+
+            for dx, dy in offsets:
+                nxt = (pos[0] + dx, pos[1] + dy)
+                if not board.is_valid(nxt):
+                    continue
+                new_g = g + board.get_cost(nxt)
+                dest = owner_of(nxt, workers)
+                if dest == index:
+                    relax(nxt, new_g, pos)
+                else:
+                    outboxes[dest].append((nxt, new_g, pos))
+
+        # 3. Envia os lotes (conta antes de enviar: enviados >= recebidos sempre).
+        for dest, batch in enumerate(outboxes):
+            if batch:
+                sent[index] += 1
+                inboxes[dest].put(("nodes", batch))
+
+        # 4. Sem trabalho local: fica ocioso até chegar mensagem.
+        if not open_list and not is_idle:
+            is_idle = True
+            idle[index] = 1
+
+    board.close()
+
+
+def hda_star_search(board, start_pos, end_pos, heuristic_func, workers=4):
+    """
+    Busca paralela com 'workers' processos. Devolve a mesma tupla final das
+    outras buscas: (path, nodes_expanded, g_costs, initial_h), com nós
+    expandidos somados entre os processos e g_costs das casas do caminho.
+    """
+    initial_h = heuristic_func(start_pos, end_pos, board.min_cost)
+    if not board.is_valid(end_pos):
+        return None, 0, {}, initial_h
+
+    ctx = mp.get_context()
+    shm = share_board(board)
+    inboxes = [ctx.Queue() for _ in range(workers)]
+    results = ctx.Queue()
+    idle = ctx.RawArray("b", workers)
+    activity = ctx.RawArray("q", workers)
+    # Última posição de 'sent' é a do coordenador (envio do nó inicial).
+    sent = ctx.RawArray("q", workers + 1)
+    received = ctx.RawArray("q", workers)
+    incumbent = ctx.RawValue("d", math.inf)
+
+    procs = [
+        ctx.Process(target=_worker, args=(
+            i, workers, shm.name, board.size, dict(board.costs), board.moves, end_pos, heuristic_func,
+            inboxes, results, idle, activity, sent, received, incumbent))
+        for i in range(workers)
+    ]
+    try:
+        for p in procs:
+            p.start()
+
+        sent[workers] += 1
+        inboxes[owner_of(start_pos, workers)].put(("nodes", [(start_pos, 0, None)]))
+
+        # Detecção de término: duas leituras iguais com todos ociosos e
+        # nenhum lote em trânsito.
+        def snapshot():
+            return (list(idle), list(activity), sum(sent), sum(received))
+
+        previous = None
+        while True:
+            time.sleep(0.002)
+            snap = snapshot()
+            quiet = all(snap[0]) and snap[2] == snap[3]
+            if quiet and snap == previous:
+                break
+            previous = snap if quiet else None
+
+        # Reconstrói o caminho perguntando o pai de cada casa ao dono dela.
+        path = None
+        g_costs = {}
+        if incumbent.value != math.inf:
+            path = []
+            pos = end_pos
+            while pos is not None:
+                inboxes[owner_of(pos, workers)].put(("parent", pos))
+                _, _, parent, g = results.get()
+                path.append(pos)
+                g_costs[pos] = g
+                pos = parent
+            path.reverse()
+
+        for inbox in inboxes:
+            inbox.put(("stop",))
+        nodes_expanded = 0
+        for _ in range(workers):
+            _, _, expanded = results.get()
+            nodes_expanded += expanded
+        for p in procs:
+            p.join()
+    finally:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+        shm.close()
+        shm.unlink()
+
+    return path, nodes_expanded, g_costs, initial_h
+
+
+# --- Relatório de escalabilidade ---
+
+def scaling_report(size=128, worker_counts=(1, 2, 4), seed=0, queries=3,
+                   heuristic_func=h3_knight_unbounded):
+    """
+    Mede o tempo do HDA* com 1..N processos em tabuleiros sorteados (semente
+    fixa) e calcula aceleração e eficiência em relação a 1 processo. Também
+    confere que o custo é o mesmo do A* sequencial.
+    """
+    random.seed(seed)
+    board = Board(size)
+    rng = random.Random(seed)
+    valid = [(x, y) for y in range(size) for x in range(size) if board.is_valid((x, y))]
+    pairs = [tuple(rng.sample(valid, 2)) for _ in range(queries)]
+
+    reference = []
+    t0 = time.perf_counter()
+    for start, goal in pairs:
+        path, _, g_costs, _ = run_search(board, start, goal, heuristic_func)
+        reference.append(g_costs[goal] if path else None)
+    serial_time = time.perf_counter() - t0
+
+    rows = []
+    for n in worker_counts:
+        nodes = 0
+        t0 = time.perf_counter()
+        for (start, goal), expected in zip(pairs, reference):
+            path, expanded, g_costs, _ = hda_star_search(board, start, goal, heuristic_func, workers=n)
+            cost = g_costs[goal] if path else None
+            if cost != expected and not (cost and expected and math.isclose(cost, expected)):
+                raise AssertionError(f"HDA* ({n} processos) achou {cost}, esperado {expected}")
+            nodes += expanded
+        rows.append({"workers": n, "seconds": time.perf_counter() - t0, "nodes": nodes})
+
+    base = rows[0]["seconds"]
+    for row in rows:
+        row["speedup"] = base / row["seconds"]
+        row["efficiency"] = row["speedup"] / row["workers"]
+    return {"size": size, "queries": queries, "serial_a_star_seconds": serial_time, "rows": rows}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Escalabilidade do HDA* de 1 a N processos")
+    parser.add_argument("--size", type=int, default=128)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--queries", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = scaling_report(args.size, args.workers, args.seed, args.queries)
+    print("=================================================================")
+    print(f"HDA* — tabuleiro {report['size']}x{report['size']}, {report['queries']} consultas, "
+          f"{mp.cpu_count()} núcleos disponíveis")
+    print("=================================================================")
+    print(f"A* sequencial (referência): {report['serial_a_star_seconds']:.2f} s")
+    for row in report["rows"]:
+        print(f"{row['workers']:>2} processos: {row['seconds']:.2f} s | nós {row['nodes']} | "
+              f"aceleração {row['speedup']:.2f}x | eficiência {100 * row['efficiency']:.0f}%")
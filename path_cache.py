@@ -0,0 +1,151 @@
+# path_cache.py
+from collections import OrderedDict
+
+from a_star import a_star_search
+
+
+class PathCache:
+    """
+    Cache de resultados de busca para UM tabuleiro.
+
+    - Chave exata: (início, objetivo, heurística, função de busca). Um acerto
+      devolve o resultado completo (caminho, nós expandidos, g_costs, listas
+      finais), então o visualizador mostra as mesmas métricas da busca original.
+    - Sub-caminhos: todo prefixo de um caminho ótimo também é ótimo, então cada
+      caminho guardado responde também (início, p) para toda casa p dele,
+      com qualquer heurística admissível.
+    - Invalidação: o cache inteiro é descartado quando board.version muda
+      (randomize(), set_terrain(), ...).
+    - Limite: no máximo max_entries resultados exatos (LRU); ao sair um
+      resultado, saem também os prefixos que apontavam para ele.
+    """
+
+    def __init__(self, board, max_entries=128):
+        self.board = board
+        self.max_entries = max_entries
+        self._version = board.version
+        self._entries = OrderedDict()   # chave exata -> resultado
+        self._prefixes = {}             # (início, casa) -> (chave exata, índice no caminho)
+
+        self.hits = 0
+        self.subpath_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _sync_version(self):
+        if self.board.version != self._version:
+            self._entries.clear()
+            self._prefixes.clear()
+            self._version = self.board.version
+            self.invalidations += 1
+
+    def get(self, start_pos, end_pos, heuristic_func, search_function=a_star_search, allow_subpath=True):
+        """
+        Procura um resultado. Devolve um dicionário com 'path', 'nodes',
+        'g_costs', 'initial_h', 'closed_set', 'open_set' e 'subpath'
+        (True se veio de um prefixo de outro caminho), ou None.
+        """
+        self._sync_version()
+
+        key = (start_pos, end_pos, heuristic_func, search_function)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        ref = self._prefixes.get((start_pos, end_pos)) if allow_subpath else None
+        if ref is not None:
+            source_key, index = ref
+            source = self._entries[source_key]
+            self._entries.move_to_end(source_key)
+            self.subpath_hits += 1
+            path = source['path'][:index + 1]
+            return {
+                'path': path,
+                'nodes': 0,  # nenhuma casa expandida para responder
+                'g_costs': {p: source['g_costs'][p] for p in path},
+                'initial_h': heuristic_func(start_pos, end_pos, self.board.min_cost),
+                'closed_set': set(),
+                'open_set': set(),
+                'subpath': True,
+            }
+
+        self.misses += 1
+        return None
+
+    def put(self, start_pos, end_pos, heuristic_func, result, search_function=a_star_search,
+            closed_set=None, open_set=None):
+        """ Guarda a tupla final (path, nodes, g_costs, initial_h) de uma busca. """
+        self._sync_version()
+
+        path, nodes, g_costs, initial_h = result
+        key = (start_pos, end_pos, heuristic_func, search_function)
+        self._entries[key] = {
+            'path': path,
+            'nodes': nodes,
+            'g_costs': g_costs,
+            'initial_h': initial_h,
+            'closed_set': set(closed_set or ()),
+            'open_set': set(open_set or ()),
+            'subpath': False,
+        }
+        self._entries.move_to_end(key)
+
+        if path:
+            for index, pos in enumerate(path[1:], start=1):
+                self._prefixes.setdefault((start_pos, pos), (key, index))
+
+        while len(self._entries) > self.max_entries:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        old_key, old = self._entries.popitem(last=False)
+        for pos in old['path'] or ():
+            ref_key = (old_key[0], pos)
+            if self._prefixes.get(ref_key, (None,))[0] == old_key:
+                del self._prefixes[ref_key]
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.subpath_hits + self.misses
+        return (self.hits + self.subpath_hits) / total if total else 0.0
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'subpath_hits': self.subpath_hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hit_rate,
+        }
+
+    def wrap(self, search_function=a_star_search):
+        """
+        Devolve uma função de busca com o mesmo protocolo de gerador de
+        'search_function', mas que consulta o cache antes. Num acerto, emite
+        um único estado (as listas finais guardadas) e retorna na hora.
+        Só acertos exatos são usados, para manter as métricas por heurística.
+        """
+        def cached_search(board, start_pos, end_pos, heuristic_func):
+            if board is not self.board:
+                return (yield from search_function(board, start_pos, end_pos, heuristic_func))
+
+            entry = self.get(start_pos, end_pos, heuristic_func, search_function, allow_subpath=False)
+            if entry is not None:
+                yield {'open': entry['open_set'], 'closed': entry['closed_set'], 'current': end_pos}
+                return entry['path'], entry['nodes'], entry['g_costs'], entry['initial_h']
+
+            state = {}
+            gen = search_function(board, start_pos, end_pos, heuristic_func)
+            while True:
+                try:
+                    state = next(gen)
+                except StopIteration as e:
+                    self.put(start_pos, end_pos, heuristic_func, e.value, search_function,
+                             state.get('closed'), state.get('open'))
+                    return e.value
+                yield state
+
+        return cached_search
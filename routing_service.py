@@ -0,0 +1,296 @@
+# routing_service.py
+"""
+Serviço de rotas assíncrono (asyncio) sobre um socket local.
+
+Protocolo: uma requisição JSON por linha, uma resposta JSON por linha.
+    -> {"board": "default", "start": [1, 1], "goal": [6, 6], "heuristic": "H2"}
+    <- {"path": [[1, 1], ...], "cost": 7.5, "nodes": 12, "version": 3, "cached": false, "coalesced": false}
+
+"cached" diz que a resposta saiu do cache de resultados; "coalesced", que a
+requisição pegou carona numa busca idêntica que já estava em andamento.
+
+As buscas (CPU) rodam num executor. Requisições idênticas em andamento
+(tabuleiro, versão do terreno, início, objetivo, heurística) são agrupadas
+numa única busca, e os resultados recentes ficam num cache LRU limitado que é
+descartado quando a versão do terreno do tabuleiro muda.
+
+Heurísticas: H1 (qualquer peça), H2 e H3 (só cavalo; em tabuleiros com
+outra peça a requisição é recusada) e HS, a de saltos da peça de cada
+tabuleiro (step_heuristic(board.moves)).
+
+Uso local (sobe o servidor e dispara o gerador de carga contra ele):
+    python routing_service.py --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from board import Board, KNIGHT
+from a_star import a_star_search, run_search
+from heuristics import h1_chebyshev, h2_knight_distance, h3_knight_unbounded, step_heuristic
+
+DEFAULT_HEURISTICS = {
+    "H1": h1_chebyshev,
+    "H2": h2_knight_distance,
+    "H3": h3_knight_unbounded,
+}
+
+# Contam saltos de CAVALO: superestimam (e perdem o ótimo) com outras peças.
+KNIGHT_ONLY_HEURISTICS = (h2_knight_distance, h3_knight_unbounded)
+
+
+def _solve(board, start_pos, end_pos, heuristic_func, search_function):
+    """ Executada no executor: roda a busca inteira e resume o resultado. """
+    path, nodes, g_costs, _ = run_search(board, start_pos, end_pos, heuristic_func, search_function)
+    cost = g_costs.get(end_pos, math.inf) if path else math.inf
+    return {
+        "path": [list(p) for p in path] if path else None,
+        "cost": cost if cost != math.inf else None,
+        "nodes": nodes,
+    }
+
+
+class RoutingServer:
+    """
+    Envolve a_star_search e um conjunto de Boards nomeados.
+    'executor' pode ser qualquer concurrent.futures.Executor (ex.: um
+    ProcessPoolExecutor para fugir do GIL; nesse caso o Board é copiado por
+    pickle a cada busca). Sem executor, o servidor cria um ThreadPoolExecutor
+    próprio e o desliga em stop().
+    """
+
+    def __init__(self, boards, heuristics=None, search_function=a_star_search,
+                 executor=None, cache_size=1024):
+        self.boards = boards
+        self.heuristics = heuristics or DEFAULT_HEURISTICS
+        self.search_function = search_function
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor()
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()      # chave -> resultado (LRU)
+        self._cache_versions = {}        # nome do tabuleiro -> versão em cache
+        self._inflight = {}              # chave -> asyncio.Task da busca
+
+        self.stats = {"requests": 0, "hits": 0, "coalesced": 0, "computations": 0, "errors": 0}
+
+    # --- Cache ---
+
+    def _check_version(self, board_name, version):
+        """ Descarta o cache do tabuleiro se o terreno mudou desde a última vez. """
+        if self._cache_versions.get(board_name) != version:
+            for key in [k for k in self._cache if k[0] == board_name]:
+                del self._cache[key]
+            self._cache_versions[board_name] = version
+
+    def _cache_put(self, key, result):
+        # Só guarda se o terreno ainda está na versão usada na busca.
+        if self._cache_versions.get(key[0]) != key[1]:
+            return
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # --- Rotas ---
+
+    def heuristic_for(self, board, heuristic_name):
+        """
+        Heurística de um nome para um tabuleiro. "HS" é a de saltos da peça
+        do tabuleiro; H2/H3 (do cavalo) são recusadas com ValueError em
+        tabuleiros com outra peça.
+        """
+        if heuristic_name == "HS":
+            return step_heuristic(board.moves)
+        heuristic_func = self.heuristics[heuristic_name]
+        if heuristic_func in KNIGHT_ONLY_HEURISTICS and board.moves != KNIGHT:
+            raise ValueError(f"{heuristic_name} só vale para o cavalo, não para {board.moves.name}; use HS ou H1")
+        return heuristic_func
+
+    async def route(self, board_name, start_pos, end_pos, heuristic_name):
+        """ Resolve uma consulta, usando cache e agrupamento de buscas iguais. """
+        self.stats["requests"] += 1
+        board = self.boards[board_name]
+        heuristic_func = self.heuristic_for(board, heuristic_name)
+        start_pos, end_pos = tuple(start_pos), tuple(end_pos)
+
+        self._check_version(board_name, board.version)
+        key = (board_name, board.version, start_pos, end_pos, heuristic_name)
+
+        if key in self._cache:
+            self.stats["hits"] += 1
+            self._cache.move_to_end(key)
+            return dict(self._cache[key], version=key[1], cached=True, coalesced=False)
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            result = await asyncio.shield(task)
+            return dict(result, version=key[1], cached=False, coalesced=True)
+
+        # A busca roda numa tarefa própria, compartilhada por todos que pedem
+        # a mesma chave: se quem a iniciou for cancelado (timeout do cliente,
+        # wait_for, desligamento), os outros continuam recebendo o resultado.
+        task = asyncio.ensure_future(self._compute(key, board, start_pos, end_pos, heuristic_func))
+        task.add_done_callback(lambda t: self._finish(key, t))
+        self._inflight[key] = task
+        self.stats["computations"] += 1
+        result = await asyncio.shield(task)
+        return dict(result, version=key[1], cached=False, coalesced=False)
+
+    async def _compute(self, key, board, start_pos, end_pos, heuristic_func):
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self.executor, _solve, board, start_pos, end_pos, heuristic_func, self.search_function
+        )
+        self._cache_put(key, result)
+        return result
+
+    def _finish(self, key, task):
+        # Roda quando a busca termina de qualquer jeito (resultado, erro ou
+        # cancelamento), então a chave nunca fica presa em _inflight.
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Evita aviso de "exception never retrieved" quando ninguém esperou.
+        if not task.cancelled():
+            task.exception()
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    req = json.loads(line)
+                    resp = await self.route(req.get("board", "default"), req["start"],
+                                            req["goal"], req.get("heuristic", "H2"))
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    resp = {"error": f"{type(e).__name__}: {e}"}
+                writer.write(json.dumps(resp).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=0):
+        """ Sobe o servidor TCP local. port=0 escolhe uma porta livre. """
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+        if self._owns_executor:
+            # Sem esperar: buscas ainda rodando terminam e as threads saem.
+            self.executor.shutdown(wait=False)
+
+
+# --- Gerador de carga ---
+
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+async def load_test(host, port, queries, concurrency=20):
+    """
+    Dispara 'queries' (lista de dicionários de requisição) contra o servidor
+    usando 'concurrency' conexões e devolve vazão, percentis de latência (ms)
+    e quantas respostas vieram do cache ou de uma busca agrupada.
+    """
+    pending = list(queries)
+    latencies = []
+    errors = cached = coalesced = 0
+
+    async def worker():
+        nonlocal errors, cached, coalesced
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while pending:
+                query = pending.pop()
+                t0 = time.perf_counter()
+                writer.write(json.dumps(query).encode("utf-8") + b"\n")
+                await writer.drain()
+                resp = json.loads(await reader.readline())
+                latencies.append((time.perf_counter() - t0) * 1000)
+                if "error" in resp:
+                    errors += 1
+                cached += bool(resp.get("cached"))
+                coalesced += bool(resp.get("coalesced"))
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "cached": cached,
+        "coalesced": coalesced,
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50": _percentile(latencies, 50),
+        "p90": _percentile(latencies, 90),
+        "p99": _percentile(latencies, 99),
+        "max": latencies[-1] if latencies else 0.0,
+    }
+
+
+def random_queries(board, n, heuristics=("H1", "H2"), distinct=50, seed=0, board_name="default"):
+    """ Gera n consultas sorteadas entre 'distinct' pares diferentes (para exercitar o cache). """
+    rng = random.Random(seed)
+    valid = [(x, y) for y in range(board.size) for x in range(board.size) if board.is_valid((x, y))]
+    pairs = [rng.sample(valid, 2) for _ in range(distinct)]
+    queries = []
+    for _ in range(n):
+        start, goal = rng.choice(pairs)
+        queries.append({"board": board_name, "start": list(start), "goal": list(goal),
+                        "heuristic": rng.choice(heuristics)})
+    return queries
+
+
+async def _demo(args):
+    random.seed(args.seed)
+    board = Board(args.size)
+    heuristics = ("H1", "H3") if args.size != 8 else ("H1", "H2")
+    server = RoutingServer({"default": board}, cache_size=args.cache_size)
+    host, port = await server.start()
+    print(f"Servidor em {host}:{port} (tabuleiro {args.size}x{args.size})")
+
+    queries = random_queries(board, args.requests, heuristics, args.distinct, args.seed)
+    report = await load_test(host, port, queries, args.concurrency)
+    await server.stop()
+
+    print("=================================================================")
+    print("CARGA NO SERVIÇO DE ROTAS")
+    print("=================================================================")
+    print(f"Requisições: {report['requests']} ({report['errors']} erros) em {report['seconds']:.2f} s | "
+          f"respostas do cache: {report['cached']} | agrupadas: {report['coalesced']}")
+    print(f"Vazão: {report['throughput']:.1f} req/s")
+    print(f"Latência (ms): p50={report['p50']:.2f} p90={report['p90']:.2f} "
+          f"p99={report['p99']:.2f} max={report['max']:.2f}")
+    s = server.stats
+    print(f"Buscas: {s['computations']} | cache: {s['hits']} | agrupadas: {s['coalesced']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor de rotas + gerador de carga local")
+    parser.add_argument("--size", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--distinct", type=int, default=50, help="pares (início, objetivo) diferentes")
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(_demo(parser.parse_args()))
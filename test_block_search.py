@@ -0,0 +1,102 @@
+import random
+import math
+
+from board import Board
+from a_star import a_star_search, run_search
+from differential import random_pairs, result_error
+from block_search import _local_bfs, a_star_search_blocks, benchmark_report, find_uniform_regions
+from heuristics import h1_chebyshev, h2_knight_distance, h3_knight_unbounded
+
+
+def _board_from_map(terrain_map):
+    board = Board()
+    board._build_grid_from_map(terrain_map)
+    return board
+
+
+def _blocky_map(rng):
+    """
+    Mapa 8x8 com um grande bloco uniforme (como as regiões de "Terra" ou
+    "Estrada" dos mapas reais) e ruído aleatório no resto.
+    """
+    terrain_map = [[rng.choice([0, 1, 1, 2, 3]) for _ in range(8)] for _ in range(8)]
+    fill = rng.choice([0, 1])
+    x0, y0 = rng.randint(0, 2), rng.randint(0, 2)
+    w, h = rng.randint(5, 8 - x0), rng.randint(5, 8 - y0)
+    for y in range(y0, y0 + h):
+        for x in range(x0, x0 + w):
+            terrain_map[y][x] = fill
+    return terrain_map
+
+
+def _assert_same_optimum(board, start, goal, heuristic):
+    result = run_search(board, start, goal, heuristic, a_star_search_blocks)
+    error = result_error(board, start, goal, result)
+    assert error is None, error
+
+
+def test_find_uniform_regions_on_uniform_board():
+    board = _board_from_map([[1] * 8 for _ in range(8)])
+    regions, region_of = find_uniform_regions(board)
+
+    assert len(regions) == 1
+    assert (regions[0].w, regions[0].h) == (8, 8)
+    assert len(region_of) == 64
+    assert sum(1 for y in range(8) for x in range(8) if regions[0].is_interior((x, y))) == 16
+
+
+def test_blocks_match_baseline_on_uniform_board():
+    board = _board_from_map([[0] * 8 for _ in range(8)])
+    cells = [(x, y) for y in range(8) for x in range(8)]
+    for start in cells:
+        for goal in cells:
+            if start != goal:
+                _assert_same_optimum(board, start, goal, h2_knight_distance)
+
+
+def test_blocks_match_baseline_on_blocky_boards():
+    rng = random.Random(26)
+    for _ in range(60):
+        board = _board_from_map(_blocky_map(rng))
+        for start, goal in random_pairs(board, rng, 10):
+            for heuristic in (h1_chebyshev, h2_knight_distance):
+                _assert_same_optimum(board, start, goal, heuristic)
+
+
+def test_blocks_expand_fewer_nodes_on_uniform_board():
+    board = _board_from_map([[1] * 8 for _ in range(8)])
+    _, base_nodes, _, _ = run_search(board, (3, 3), (4, 4), h1_chebyshev, a_star_search)
+    _, block_nodes, _, _ = run_search(board, (3, 3), (4, 4), h1_chebyshev, a_star_search_blocks)
+    assert block_nodes <= base_nodes
+
+
+def test_g_costs_follow_the_returned_path():
+    # Bloco grande de Terra: o caminho atravessa macro-movimentos e as casas
+    # internas precisam do g do caminho, não de um relaxamento anterior.
+    for seed in range(40):
+        random.seed(seed)
+        board = Board(16)
+        terrain_map = [[random.choice([0, 1, 2, 3]) for _ in range(16)] for _ in range(16)]
+        for y in range(1, 14):
+            for x in range(1, 14):
+                terrain_map[y][x] = 1
+        terrain_map[0][0] = terrain_map[15][15] = 1
+        board._build_grid_from_map(terrain_map)
+        path, _, g_costs, _ = run_search(board, (0, 0), (15, 15), h3_knight_unbounded, a_star_search_blocks)
+        if path is None:
+            continue
+        g = 0
+        for pos in path[1:]:
+            g += board.get_cost(pos)
+            assert math.isclose(g_costs[pos], g), (seed, pos)
+
+
+def test_blocks_expand_fewer_nodes_on_large_uniform_board():
+    # Só contagens e custos: os tempos ficam no benchmark_report() (README).
+    for row in benchmark_report(96, runs=1):
+        base, block = row["a_star"], row["blocks"]
+        assert math.isclose(block["cost"], base["cost"])
+        assert block["nodes"] <= base["nodes"]
+    # As BFS locais ficam num cache limitado.
+    info = _local_bfs.cache_info()
+    assert info.currsize <= info.maxsize
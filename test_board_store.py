@@ -0,0 +1,66 @@
+import array
+import math
+import random
+from multiprocessing import Pool
+
+import pytest
+
+from board import Board
+from a_star import run_search
+from board_store import FORMAT_VERSION, MAGIC, load_board, save_board
+from heuristics import h3_knight_unbounded
+
+
+def _worker_cost_sum(path):
+    # Cada processo abre o mesmo arquivo somente-leitura.
+    with load_board(path) as board:
+        return sum(c for c in board.tables["labels"]), board.get_cost((5, 7))
+
+
+def test_round_trip_keeps_terrain_and_tables(tmp_path):
+    random.seed(28)
+    board = Board(48)
+    labels = array.array("i", (x % 7 for x in range(48 * 48)))
+    path = tmp_path / "board.knb"
+    save_board(board, path, tables={"labels": labels, "dist": [0.5, math.inf, 2.0]})
+
+    with load_board(path) as mapped:
+        assert mapped.size == 48
+        assert mapped.costs == board.costs
+        assert mapped.min_cost == board.min_cost
+        assert all(list(mapped.grid[y]) == board.grid[y] for y in range(48))
+        assert list(mapped.tables["labels"]) == list(labels)
+        assert list(mapped.tables["dist"]) == [0.5, math.inf, 2.0]
+
+        # A busca dá o mesmo resultado no tabuleiro mapeado.
+        start, goal = (1, 2), (45, 40)
+        assert mapped.is_valid(start) == board.is_valid(start)
+        assert mapped.get_cost(goal) == board.get_cost(goal)
+        expected = run_search(board, start, goal, h3_knight_unbounded)
+        got = run_search(mapped, start, goal, h3_knight_unbounded)
+        assert got[0] == expected[0]
+
+        with pytest.raises(ValueError):
+            mapped.set_terrain((0, 0), "Lama")
+
+
+def test_shared_read_only_between_processes(tmp_path):
+    random.seed(5)
+    board = Board(16)
+    path = str(tmp_path / "board.knb")
+    save_board(board, path, tables={"labels": array.array("i", range(256))})
+
+    with Pool(3) as pool:
+        results = pool.map(_worker_cost_sum, [path] * 3)
+    assert results == [(sum(range(256)), board.get_cost((5, 7)))] * 3
+
+
+def test_rejects_other_versions(tmp_path):
+    path = tmp_path / "board.knb"
+    save_board(Board(), path)
+    data = bytearray(path.read_bytes())
+    data[len(MAGIC):len(MAGIC) + 4] = (FORMAT_VERSION + 1).to_bytes(4, "little")
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError):
+        load_board(path)
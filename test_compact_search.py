@@ -0,0 +1,64 @@
+import math
+import random
+
+from board import Board, TerrainModel, ZEBRA
+from a_star import a_star_search, run_search
+from compact_search import a_star_search_compact
+from differential import random_pairs, result_error
+from heuristics import h1_chebyshev, h2_knight_distance, step_heuristic
+from memory_profile import profile_search, scaling_report
+
+
+def test_compact_matches_reference_cost():
+    random.seed(35)
+    rng = random.Random(35)
+    for size, moves in ((8, Board().moves), (20, Board().moves), (15, ZEBRA)):
+        for _ in range(15):
+            board = Board(size, moves=moves)
+            start, goal = random_pairs(board, rng, 1)[0]
+            result = run_search(board, start, goal, step_heuristic(moves), a_star_search_compact)
+            error = result_error(board, start, goal, result)
+            assert error is None, error
+
+
+def test_states_and_results_behave_like_sets_and_dicts():
+    random.seed(2)
+    board = Board()
+    for h in (h1_chebyshev, h2_knight_distance):
+        gen = a_star_search_compact(board, (0, 0), (7, 7), h)
+        states = []
+        while True:
+            try:
+                state = next(gen)
+                states.append((state['current'], set(state['closed']), set(state['open'])))
+            except StopIteration as e:
+                path, nodes, g_costs, _ = e.value
+                break
+        reference = run_search(board, (0, 0), (7, 7), h, a_star_search)
+        assert (path is None) == (reference[0] is None)
+        assert nodes == len(states)
+        for current, closed, open_cells in states:
+            assert current in closed and not (closed & open_cells)
+        closed = state['closed'].copy()
+        assert len(closed) == nodes and (0, 0) in closed and (8, 0) not in closed
+        assert set(g_costs.copy()) == set(g_costs) and g_costs.get((-1, 0)) is None
+        assert set(state['open'].copy()) == set(state['open'])
+
+
+def test_memory_profile_and_scaling_report():
+    profile = profile_search(24, "compact", top=3)
+    assert [p["phase"] for p in profile["phases"]] == ["tabuleiro", "busca", "resultados"]
+    rows = scaling_report(sizes=(16, 64))
+    by_engine = {(r["size"], r["engine"]): r for r in rows}
+    # Pico da busca compacta: ~16 bytes por casa (com folga para objetos fixos).
+    assert by_engine[(64, "compact")]["bytes_per_cell"] < 20
+    assert by_engine[(64, "compact")]["search_peak"] < by_engine[(64, "a_star")]["search_peak"]
+
+
+def test_zero_cost_terrain_does_not_loop():
+    terrain = TerrainModel({"Gelo": 0.0, "Terra": 1.0, "Barreira": math.inf})
+    board = Board(8, terrain=terrain)
+    board._build_grid_from_map([[0] * 8 for _ in range(8)])
+    path, _, g_costs, _ = run_search(board, (0, 0), (7, 7), h1_chebyshev, a_star_search_compact)
+    assert path[0] == (0, 0) and path[-1] == (7, 7) and len(set(path)) == len(path)
+    assert g_costs[(7, 7)] == 0.0
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+from a_star import run_search
+from board import Board, CAMEL
+from differential import check, check_case, generate_case, path_cost, run_harness, shrink
+from heuristics import h3_knight_unbounded
+
+
+def _overestimating_engine(board, start, goal, h):
+    # Motor com defeito de propósito: heurística inflada (não admissível).
+    return run_search(board, start, goal, lambda a, b, m: 10 * h3_knight_unbounded(a, b, m))
+
+
+BROKEN = {"broken": (_overestimating_engine, 1)}
+
+
+def test_all_engines_agree_within_budget():
+    report = run_harness(budget_seconds=3, workers=2, seed=33)
+    assert report["cases"] > 50
+    assert report["failures"] == []
+
+
+def test_failures_are_shrunk_to_smaller_boards():
+    shrunk_any = False
+    for seed in range(60):
+        case = generate_case(seed)
+        if case is None:
+            continue
+        failures = check_case(case, BROKEN)
+        if not failures:
+            continue
+        _, heuristic_name, _ = failures[0]
+        small = shrink(case, "broken", heuristic_name, BROKEN)
+
+        # Continua falhando, e nunca fica maior que o original.
+        assert check(small, "broken", heuristic_name, BROKEN) is not None
+        assert small["size"] <= case["size"]
+        shrunk_any = shrunk_any or small["size"] < case["size"]
+    assert shrunk_any
+
+
+def _wrong_goal_g_engine(board, start, goal, h):
+    # Caminho certo, mas g do objetivo errado (como o bug antigo do blocks).
+    path, nodes, g_costs, initial_h = run_search(board, start, goal, h)
+    g_costs = dict(g_costs)
+    if path is not None:
+        g_costs[goal] += 1
+    return path, nodes, g_costs, initial_h
+
+
+def test_goal_g_must_match_path_cost():
+    engines = {"wrong_g": (_wrong_goal_g_engine, 1)}
+    failures = [check(case, "wrong_g", "H1", engines)
+                for case in map(generate_case, range(30)) if case is not None]
+    assert any(f is not None and "g_costs" in f for f in failures)
+
+
+def test_shrink_respects_deadline():
+    case = next(c for c in map(generate_case, range(60)) if c and check_case(c, BROKEN))
+    _, heuristic_name, _ = check_case(case, BROKEN)[0]
+    t0 = time.time()
+    small = shrink(case, "broken", heuristic_name, BROKEN, deadline=t0)
+    assert small == case and time.time() - t0 < 1
+
+
+def test_cases_are_reproducible():
+    assert generate_case(123) == generate_case(123)
+    assert generate_case(123) != generate_case(124)
+
+
+def test_path_cost_checks_the_board_piece():
+    # (0,0)->(1,3) é salto de camelo, não de cavalo.
+    board = Board(8, moves=CAMEL)
+    for pos in ((0, 0), (1, 3), (1, 2)):
+        board.set_terrain(pos, "Estrada")
+    assert path_cost(board, [(0, 0), (1, 3)]) == board.get_cost((1, 3))
+    with pytest.raises(ValueError):
+        path_cost(board, [(0, 0), (1, 2)])
@@ -0,0 +1,67 @@
+import random
+
+from board import Board
+from a_star import a_star_search, run_search
+from heuristics import (
+    TABLE_CACHE_SIZE, clear_heuristic_tables, h1_chebyshev, h2_knight_distance, h3_knight_unbounded,
+    heuristic_table,
+)
+
+HEURISTICS = (h1_chebyshev, h2_knight_distance, h3_knight_unbounded)
+
+
+def _scalar_only(heuristic_func):
+    # Mesma função, mas sem o atributo goal_table (força a chamada escalar).
+    return lambda current, goal, min_cost: heuristic_func(current, goal, min_cost)
+
+
+def test_tables_match_scalar_calls():
+    for size in (8, 13):
+        board = Board(size)
+        for goal in [(0, 0), (3, 5), (size - 1, size - 2)]:
+            for heuristic in HEURISTICS:
+                table = heuristic_table(heuristic, board, goal)
+                for y in range(size):
+                    for x in range(size):
+                        assert table[y * size + x] == heuristic((x, y), goal, board.min_cost)
+
+
+def test_search_with_tables_matches_scalar_search():
+    random.seed(31)
+    rng = random.Random(31)
+    for _ in range(30):
+        board = Board()
+        valid = [(x, y) for y in range(8) for x in range(8) if board.is_valid((x, y))]
+        start, goal = rng.sample(valid, 2)
+        for heuristic in (h1_chebyshev, h2_knight_distance):
+            batched = run_search(board, start, goal, heuristic, a_star_search)
+            scalar = run_search(board, start, goal, _scalar_only(heuristic), a_star_search)
+            assert batched[0] == scalar[0] and batched[1] == scalar[1]
+
+
+def test_heuristics_without_table_fall_back():
+    assert heuristic_table(_scalar_only(h1_chebyshev), Board(), (6, 6)) is None
+
+
+def test_short_queries_on_large_boards_skip_the_table():
+    random.seed(4)
+    board = Board(256)
+    board._build_grid_from_map([[1] * 256 for _ in range(256)])
+    path, nodes, _, _ = run_search(board, (100, 100), (104, 103), h3_knight_unbounded, a_star_search)
+    assert path is not None and nodes < 50
+    assert heuristic_table(h3_knight_unbounded, board, (104, 103), build=False) is None
+
+
+def test_table_cache_is_small():
+    board = Board(16)
+    for x in range(TABLE_CACHE_SIZE + 3):
+        heuristic_table(h3_knight_unbounded, board, (x, 0))
+    assert heuristic_table(h3_knight_unbounded, board, (0, 0), build=False) is None
+    assert heuristic_table(h3_knight_unbounded, board, (TABLE_CACHE_SIZE + 2, 0), build=False) is not None
+
+
+def test_clear_heuristic_tables():
+    board = Board(16)
+    heuristic_table(h3_knight_unbounded, board, (3, 3))
+    clear_heuristic_tables()
+    assert heuristic_table(h3_knight_unbounded, board, (3, 3), build=False) is None
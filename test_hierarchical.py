@@ -0,0 +1,93 @@
+import random
+
+from board import Board, CAMEL, KING_KNIGHT, ZEBRA
+from a_star import run_search
+from compact_search import a_star_search_compact
+from differential import path_cost, random_pairs, reference_cost, result_error
+from heuristics import h3_knight_unbounded, step_heuristic
+from hierarchical import HierarchicalPlanner, benchmark_report
+
+
+def _assert_near_optimum(board, planner, start, goal, max_ratio=1.5):
+    """ Caminho válido, achado sempre que existe, nunca abaixo do ótimo. Devolve custo / ótimo. """
+    expected = reference_cost(board, start, goal)
+    result = planner.find_path(start, goal)
+    error = result_error(board, start, goal, result, expected, exact=False)
+    assert error is None, error
+    if result[0] is None:
+        return None
+    cost = path_cost(board, result[0])
+    assert cost <= max_ratio * expected
+    return cost / expected if expected else 1.0
+
+
+def test_hierarchical_is_near_optimal():
+    random.seed(27)
+    rng = random.Random(27)
+    # Inclui tamanhos que não são múltiplos do cluster (clusters cortados na borda).
+    for size, cluster_size in [(24, 8), (30, 7), (40, 16)]:
+        board = Board(size)
+        planner = HierarchicalPlanner(board, cluster_size)
+        ratios = [r for start, goal in random_pairs(board, rng, 15)
+                  if (r := _assert_near_optimum(board, planner, start, goal)) is not None]
+        assert sum(ratios) / len(ratios) < 1.15
+
+
+def test_update_cells_rebuilds_only_touched_cluster():
+    random.seed(7)
+    rng = random.Random(7)
+    board = Board(32)
+    planner = HierarchicalPlanner(board, 8)
+    planner.precompute()
+    built = planner.tables_built
+    assert built == 16
+
+    changed = [(9, 10), (12, 13)]  # ambas no cluster (1, 1)
+    for pos in changed:
+        board.set_terrain(pos, "Lama")
+    planner.update_cells(changed)
+
+    assert planner.tables_built == built + 1
+    # Mesmas transições e tabelas que um planejador montado do zero.
+    fresh = HierarchicalPlanner(board, 8)
+    fresh.precompute()
+    assert planner._nodes == fresh._nodes and planner._tables == fresh._tables
+    for start, goal in random_pairs(board, rng, 15):
+        _assert_near_optimum(board, planner, start, goal)
+
+
+def test_abstract_graph_is_small_and_queries_beat_flat_search():
+    # Poucas transições por cluster, e uma consulta longa com as tabelas
+    # prontas expande bem menos que o A* comum (tempos em benchmark_report()).
+    random.seed(128)
+    board = Board(128)
+    diagonal = [(i, i) for i in range(128) if board.is_valid((i, i))]
+    start, goal = diagonal[0], diagonal[-1]
+    planner = HierarchicalPlanner(board, 16)
+    planner.precompute()
+    assert sum(len(nodes) for nodes in planner._nodes.values()) < 128 * 128 // 20
+
+    _, flat_nodes, _, _ = run_search(board, start, goal, h3_knight_unbounded, a_star_search_compact)
+    path, nodes, _, _ = planner.find_path(start, goal)
+    assert path is not None and 2 * nodes < flat_nodes
+
+
+def test_benchmark_report_shape():
+    report = benchmark_report(size=48, cluster_size=8, queries=2)
+    assert report["tables"] > 0 and report["speedup"] > 0
+    assert 1.0 <= report["mean_ratio"] <= report["max_ratio"]
+
+
+def test_default_heuristic_follows_the_board_moves():
+    # Sem heurística, o planejador usa a de saltos da peça (a H3 superestima
+    # o camelo: (0,0)->(1,3) é um salto só).
+    random.seed(34)
+    rng = random.Random(34)
+    for moves in (CAMEL, ZEBRA, KING_KNIGHT):
+        board = Board(24, moves=moves)
+        planner = HierarchicalPlanner(board, 8)
+        for start, goal in random_pairs(board, rng, 15):
+            _assert_near_optimum(board, planner, start, goal)
+            path, _, _, initial_h = planner.find_path(start, goal)
+            assert initial_h == step_heuristic(moves)(start, goal, board.min_cost)
+            assert path == planner.find_path(start, goal, step_heuristic(moves))[0]
@@ -0,0 +1,74 @@
+import math
+import random
+from collections import deque
+
+import pytest
+
+from board import Board, CAMEL, KING_KNIGHT, KNIGHT, MOVE_SETS, TerrainModel, ZEBRA
+from a_star import a_star_search, run_search
+from block_search import a_star_search_blocks
+from differential import random_pairs, reference_cost, result_error
+from heuristics import h3_knight_unbounded, heuristic_table, step_heuristic
+
+
+def test_default_board_keeps_knight_and_original_costs():
+    board = Board()
+    assert board.moves == KNIGHT
+    assert board.costs == {"Estrada": 0.5, "Terra": 1.0, "Lama": 5.0, "Barreira": math.inf}
+    assert len(KNIGHT.offsets) == 8 and len(KING_KNIGHT.offsets) == 16
+
+
+def test_custom_terrain_table():
+    terrain = TerrainModel({"Gelo": 0.2, "Neve": 3.0, "Muro": math.inf}, weights=[1, 1, 0])
+    random.seed(3)
+    board = Board(6, terrain=terrain)
+    assert board.min_cost == 0.2
+    assert {c for row in board.grid for c in row} <= {0.2, 3.0}
+
+    board._build_grid_from_map([[2, 1, 0, 0, 0, 0]] * 6)
+    assert board.grid[0][:3] == [math.inf, 3.0, 0.2]
+    board.set_terrain((2, 0), "Neve")
+    assert board.get_cost((2, 0)) == 3.0
+
+    with pytest.raises(ValueError):
+        TerrainModel({"Gelo": 0.2}, weights=[0.5, 0.5])
+
+
+@pytest.mark.parametrize("moves", [CAMEL, ZEBRA, KING_KNIGHT])
+def test_other_leapers_find_optimal_paths(moves):
+    random.seed(11)
+    rng = random.Random(11)
+    for _ in range(15):
+        board = Board(12, moves=moves)
+        start, goal = random_pairs(board, rng, 1)[0]
+        expected = reference_cost(board, start, goal)
+        for search in (a_star_search, a_star_search_blocks):
+            result = run_search(board, start, goal, step_heuristic(moves), search)
+            error = result_error(board, start, goal, result, expected)
+            assert error is None, error
+
+
+@pytest.mark.parametrize("moves", list(MOVE_SETS.values()))
+def test_step_bound_never_exceeds_empty_board_distance(moves):
+    # BFS de saltos num tabuleiro vazio grande: o limite de min_steps nunca passa dela.
+    size, origin = 21, (10, 10)
+    dist = {origin: 0}
+    queue = deque([origin])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in moves.offsets:
+            nxt = (x + dx, y + dy)
+            if 0 <= nxt[0] < size and 0 <= nxt[1] < size and nxt not in dist:
+                dist[nxt] = dist[(x, y)] + 1
+                queue.append(nxt)
+    for (x, y), steps in dist.items():
+        assert moves.min_steps(x - 10, y - 10) <= steps
+
+
+def test_step_heuristic_is_h3_for_knight_and_has_table():
+    assert step_heuristic(KNIGHT) is h3_knight_unbounded
+    h = step_heuristic(CAMEL)
+    assert h == step_heuristic(CAMEL)
+    board = Board(9, moves=CAMEL)
+    table = heuristic_table(h, board, (4, 2))
+    assert list(table) == [h((x, y), (4, 2), board.min_cost) for y in range(9) for x in range(9)]
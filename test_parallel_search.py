@@ -0,0 +1,32 @@
+import random
+import math
+
+from board import Board
+from a_star import run_search
+from differential import random_pairs, result_error
+from heuristics import h1_chebyshev, h3_knight_unbounded
+from parallel_search import hda_star_search, scaling_report
+
+
+def test_hda_star_matches_serial_cost():
+    rng = random.Random(32)
+    for seed in range(12):
+        random.seed(seed)
+        board = Board(16)
+        start, goal = random_pairs(board, rng, 1)[0]
+        heuristic = (h1_chebyshev, h3_knight_unbounded)[seed % 2]
+
+        ref_path, _, ref_g, _ = run_search(board, start, goal, heuristic)
+        path, nodes, g_costs, _ = hda_star_search(board, start, goal, heuristic, workers=1 + seed % 3)
+
+        expected = ref_g[goal] if ref_path is not None else math.inf
+        error = result_error(board, start, goal, (path, nodes, g_costs, None), expected)
+        assert error is None, error
+        assert ref_path is None or nodes > 0
+
+
+def test_scaling_report_shape():
+    report = scaling_report(size=16, worker_counts=(1, 2), seed=1, queries=2)
+    assert [row["workers"] for row in report["rows"]] == [1, 2]
+    assert report["rows"][0]["speedup"] == 1.0
+    assert all(row["efficiency"] > 0 for row in report["rows"])
@@ -0,0 +1,70 @@
+import random
+import math
+
+from board import Board
+from a_star import a_star_search, run_search
+from heuristics import h1_chebyshev, h2_knight_distance
+from path_cache import PathCache
+
+
+def _run(gen):
+    states = []
+    while True:
+        try:
+            states.append(next(gen))
+        except StopIteration as e:
+            return states, e.value
+
+
+def _solvable_board(seed):
+    random.seed(seed)
+    while True:
+        board = Board()
+        path = run_search(board, (1, 1), (6, 6), h2_knight_distance)[0]
+        if path and len(path) > 3:
+            return board, path
+
+
+def test_wrapped_search_hits_on_unchanged_board():
+    board, _ = _solvable_board(30)
+    cache = PathCache(board)
+    search = cache.wrap(a_star_search)
+
+    first_states, first = _run(search(board, (1, 1), (6, 6), h2_knight_distance))
+    again_states, again = _run(search(board, (1, 1), (6, 6), h2_knight_distance))
+
+    assert len(again_states) == 1  # só o estado final guardado
+    assert again_states[0]['closed'] == first_states[-1]['closed']
+    assert again[0] == first[0] and again[1] == first[1]
+    assert cache.hits == 1 and cache.misses == 1
+    assert cache.hit_rate == 0.5
+
+
+def test_prefixes_of_optimal_paths_are_shared():
+    board, path = _solvable_board(31)
+    cache = PathCache(board)
+    result = run_search(board, (1, 1), (6, 6), h2_knight_distance)
+    cache.put((1, 1), (6, 6), h2_knight_distance, result)
+
+    for i, mid in enumerate(path[1:-1], start=1):
+        entry = cache.get((1, 1), mid, h1_chebyshev)
+        assert entry['subpath'] and entry['path'] == path[:i + 1]
+        expected = run_search(board, (1, 1), mid, h1_chebyshev)[2][mid]
+        assert math.isclose(entry['g_costs'][mid], expected)
+    assert cache.subpath_hits == len(path) - 2
+
+
+def test_version_bump_invalidates_and_size_is_bounded():
+    board, _ = _solvable_board(32)
+    cache = PathCache(board, max_entries=2)
+    search = cache.wrap(a_star_search)
+
+    for goal in [(6, 6), (5, 6), (6, 5)]:
+        _run(search(board, (1, 1), goal, h1_chebyshev))
+    assert cache.stats()['entries'] == 2
+    # O mais antigo saiu, junto com os prefixos dele.
+    assert cache.get((1, 1), (6, 6), h1_chebyshev, allow_subpath=False) is None
+
+    board.randomize()
+    assert cache.get((1, 1), (6, 5), h1_chebyshev) is None
+    assert cache.stats()['entries'] == 0 and cache.invalidations == 1
@@ -0,0 +1,140 @@
+import asyncio
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from board import Board, CAMEL, KING_KNIGHT, ZEBRA
+from a_star import a_star_search
+from differential import reference_cost
+from routing_service import RoutingServer, load_test, random_queries
+
+
+def test_identical_requests_are_coalesced_and_cached():
+    random.seed(29)
+    board = Board()
+    server = RoutingServer({"default": board})
+    query = random_queries(board, 1, seed=29)[0]
+    start, goal = query["start"], query["goal"]
+
+    async def scenario():
+        first = await asyncio.gather(*(server.route("default", start, goal, "H2") for _ in range(20)))
+        again = await server.route("default", start, goal, "H2")
+        return first, again
+
+    first, again = asyncio.run(scenario())
+    assert server.stats["computations"] == 1
+    assert server.stats["coalesced"] == 19
+    assert again["cached"] and server.stats["hits"] == 1
+    assert all(r["path"] == first[0]["path"] for r in first)
+    # Quem pegou carona na busca em andamento não veio do cache.
+    assert not any(r["cached"] for r in first)
+    assert sum(r["coalesced"] for r in first) == 19 and not again["coalesced"]
+
+
+def test_cache_dropped_when_terrain_changes():
+    random.seed(3)
+    board = Board()
+    server = RoutingServer({"default": board}, cache_size=4)
+
+    async def scenario():
+        await server.route("default", (1, 1), (6, 6), "H1")
+        board.randomize()
+        return await server.route("default", (1, 1), (6, 6), "H1")
+
+    result = asyncio.run(scenario())
+    assert not result["cached"]
+    assert result["version"] == board.version
+    assert server.stats["computations"] == 2
+
+
+def test_load_generator_over_socket():
+    random.seed(4)
+    board = Board()
+    server = RoutingServer({"default": board}, cache_size=8)
+
+    async def scenario():
+        host, port = await server.start()
+        try:
+            return await load_test(host, port, random_queries(board, 200, distinct=20, seed=4), concurrency=8)
+        finally:
+            await server.stop()
+
+    report = asyncio.run(scenario())
+    assert report["requests"] == 200 and report["errors"] == 0
+    assert report["cached"] == server.stats["hits"]
+    assert report["coalesced"] == server.stats["coalesced"]
+    assert report["p50"] <= report["p90"] <= report["p99"] <= report["max"]
+    # LRU com 8 entradas: o cache nunca passa do limite.
+    assert len(server._cache) <= 8
+
+
+def _slow_search(board, start_pos, end_pos, heuristic_func):
+    time.sleep(0.2)
+    return (yield from a_star_search(board, start_pos, end_pos, heuristic_func))
+
+
+def test_cancelled_leader_does_not_hang_coalesced_requests():
+    random.seed(5)
+    board = Board()
+    server = RoutingServer({"default": board}, search_function=_slow_search)
+
+    async def scenario():
+        leader = asyncio.ensure_future(server.route("default", (1, 1), (6, 6), "H2"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(server.route("default", (1, 1), (6, 6), "H2"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        result = await asyncio.wait_for(follower, 3)
+        again = await server.route("default", (1, 1), (6, 6), "H2")
+        return leader, result, again
+
+    leader, result, again = asyncio.run(scenario())
+    assert leader.cancelled()
+    assert result["coalesced"] and not result["cached"] and server.stats["coalesced"] == 1
+    assert again["cached"] and server.stats["computations"] == 1
+    assert not server._inflight
+
+
+def test_other_pieces_use_their_own_step_heuristic():
+    random.seed(34)
+    for moves in (CAMEL, ZEBRA, KING_KNIGHT):
+        board = Board(16, moves=moves)
+        server = RoutingServer({"default": board})
+        queries = random_queries(board, 30, heuristics=("HS", "H1"), distinct=30, seed=34)
+
+        async def scenario():
+            return await asyncio.gather(*(server.route("default", q["start"], q["goal"], q["heuristic"])
+                                          for q in queries))
+
+        for query, result in zip(queries, asyncio.run(scenario())):
+            expected = reference_cost(board, tuple(query["start"]), tuple(query["goal"]))
+            if expected == math.inf:
+                assert result["path"] is None
+            else:
+                assert math.isclose(result["cost"], expected)
+
+        # H2/H3 contam saltos de cavalo: recusadas para outras peças.
+        for name in ("H2", "H3"):
+            with pytest.raises(ValueError):
+                asyncio.run(server.route("default", queries[0]["start"], queries[0]["goal"], name))
+
+
+def test_stop_shuts_down_only_its_own_executor():
+    board = Board()
+
+    async def start_and_stop(server):
+        await server.start()
+        await server.stop()
+
+    own = RoutingServer({"default": board})
+    asyncio.run(start_and_stop(own))
+    with pytest.raises(RuntimeError):
+        own.executor.submit(print)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        shared = RoutingServer({"default": board}, executor=executor)
+        asyncio.run(start_and_stop(shared))
+        assert executor.submit(lambda: 42).result() == 42